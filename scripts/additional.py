@@ -3,10 +3,11 @@ Get additional data from WoWs-Numbers
 """
 import re
 import requests
-import json
 import time
 import sys
 
+import json_codec
+
 
 def get_ship_battles_raw():
     """
@@ -26,7 +27,7 @@ def get_ship_battles_raw():
         ship_battles_raw = regex.findall(r)[0]
 
         # read as json string
-        raw = json.loads(ship_battles_raw)
+        raw = json_codec.loads(ship_battles_raw)
         final_dict = {}
         # adjust the format
         for ship in raw:
@@ -44,7 +45,7 @@ def get_ship_battles_raw():
 
     with open('ship_battles_raw.json', 'w') as f:
         # write as json string
-        f.write(json.dumps(battles_dict))
+        f.write(json_codec.dumps(battles_dict, ensure_ascii=True))
 
 
 def get_personal_rating():
@@ -65,7 +66,7 @@ def make_additional():
     # with open('ship_battles_raw.json', 'r') as f:
     #     ship_battles_raw = json.load(f)
     with open('personal_rating_raw.json', 'r') as f:
-        personal_rating_raw = json.load(f)
+        personal_rating_raw = json_codec.load(f)
 
     ship_data = personal_rating_raw['data']
     additional_dict = {}
@@ -88,32 +89,37 @@ def make_additional():
         additional_dict[ship] = formatted
 
     with open('additional.json', 'w') as f:
-        f.write(json.dumps(additional_dict))
+        f.write(json_codec.dumps(additional_dict, ensure_ascii=True))
 
 
-def merge_additional():
+def merge_additional(wowsinfo: dict = None) -> dict:
     """
-    Merges additional into wowsinfo.json
+    Merges additional into wowsinfo.json, or into wowsinfo if it is already in memory
     """
     with open('additional.json', 'r') as f:
-        additional_dict = json.load(f)
+        additional_dict = json_codec.load(f)
+    if wowsinfo is not None:
+        wowsinfo['number'] = additional_dict
+        return wowsinfo
+
     with open('wowsinfo.json', 'r', encoding='utf8') as f:
-        wowsinfo_dict = json.load(f)
+        wowsinfo_dict = json_codec.load(f)
 
     wowsinfo_dict['number'] = additional_dict
     with open('wowsinfo.json', 'w', encoding='utf8') as f:
-        json_str = json.dumps(wowsinfo_dict, ensure_ascii=False)
+        json_str = json_codec.dumps(wowsinfo_dict)
         f.write(json_str)
 
     print('Done.')
+    return wowsinfo_dict
 
-def runAll():
+def runAll(wowsinfo: dict = None) -> dict:
     # disabled for now
-    return
+    return wowsinfo
     # get_ship_battles_raw()
     get_personal_rating()
     make_additional()
-    merge_additional()
+    return merge_additional(wowsinfo)
 
 if __name__ == '__main__':
     # check if --all is passed in 
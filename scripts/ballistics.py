@@ -0,0 +1,156 @@
+"""
+Fly every artillery shell at once with numpy and get its penetration, impact velocity and flight time at each range,
+so the app doesn't have to do it for every shell it shows. Flight times are in game seconds, see TIME_MULTIPLIER.
+
+This is the model the community uses for World of Warships. Air gets thinner with altitude, drag is quadratic
+and linear in velocity, and a shell is moved with Euler steps until it hits the water. Trajectories are flown
+at every launch angle of the grid and the results are interpolated at every range step.
+Penetration is the Krupp formula at impact velocity, perpendicular to the plate and only for AP.
+"""
+import numpy as np
+
+G = 9.8
+# air at sea level, temperature (K), temperature lapse rate (K/m) and pressure (Pa)
+T0 = 288.15
+L = 0.0065
+P0 = 101325.0
+# gas constant and molar mass of air
+R = 8.31447
+M = 0.0289644
+# how much quadratic drag counts, linear drag depends on the diameter
+CW_1 = 1.0
+PENETRATION = 0.5561613
+# shells fly this many times faster in the game than the model says, flight times in tables are divided by it
+TIME_MULTIPLIER = 2.75
+
+
+class Ballistics:
+    """
+    Ranges are in km and tables have a value every range_step km up to max_range or as far as a shell can go
+    with launch angles up to max_angle. More angles and smaller time steps are more accurate but slower.
+    """
+
+    def __init__(self, range_step: float = 1.0, max_range: float = 30.0, angle_step: float = 0.5,
+                 max_angle: float = 45.0, time_step: float = 0.1):
+        self.range_step = range_step
+        self.max_range = max_range
+        self.angle_step = angle_step
+        self.max_angle = max_angle
+        self.time_step = time_step
+
+    def fly(self, diameter, mass, drag, velocity) -> tuple:
+        """
+        Fly shells (arrays of diameter in m, mass in kg, air drag and muzzle velocity in m/s) at every launch angle.
+        Returns the range (m), flight time (model seconds, not divided by TIME_MULTIPLIER) and impact velocity (m/s)
+        of each shell and angle.
+        Trajectories that go further than max_range are stopped, their range is inf.
+        """
+        angles = np.radians(np.arange(1, int(self.max_angle / self.angle_step) + 1) * self.angle_step)
+        shape = (len(diameter), len(angles))
+        k = np.repeat(0.5 * drag * (diameter / 2) ** 2 * np.pi / mass, len(angles))
+        cw_2 = np.repeat(100 + 1000 / 3 * diameter, len(angles))
+        v0 = np.repeat(velocity, len(angles))
+        angles = np.tile(angles, len(diameter))
+
+        dt = self.time_step
+        max_range = self.max_range * 1000
+        exponent = G * M / (R * L)
+        impact_x = np.empty(len(v0))
+        impact_t = np.empty(len(v0))
+        impact_v = np.empty(len(v0))
+
+        # only trajectories still in the air are kept, index is where their result goes
+        index = np.arange(len(v0))
+        x = np.zeros(len(v0))
+        y = np.zeros(len(v0))
+        t = np.zeros(len(v0))
+        vx = v0 * np.cos(angles)
+        vy = v0 * np.sin(angles)
+        while len(index) > 0:
+            temperature = T0 - L * y
+            density = P0 * (temperature / T0) ** exponent * M / (R * temperature)
+            drag_step = dt * k * density
+            x_next = x + dt * vx
+            y_next = y + dt * vy
+            vx_next = vx - drag_step * (CW_1 * vx * vx + cw_2 * vx)
+            vy_next = vy - dt * G - drag_step * (CW_1 * vy * np.abs(vy) + cw_2 * vy)
+
+            landed = y_next < 0
+            beyond = ~landed & (x_next > max_range)
+            if landed.any() or beyond.any():
+                # where between the last two steps it hits the water
+                f = y[landed] / (y[landed] - y_next[landed])
+                done = index[landed]
+                impact_x[done] = x[landed] + f * (x_next[landed] - x[landed])
+                impact_t[done] = t[landed] + f * dt
+                impact_v[done] = np.hypot(vx[landed] + f * (vx_next[landed] - vx[landed]),
+                                          vy[landed] + f * (vy_next[landed] - vy[landed]))
+                impact_x[index[beyond]] = np.inf
+
+                flying = ~(landed | beyond)
+                index, k, cw_2, t = index[flying], k[flying], cw_2[flying], t[flying]
+                x_next, y_next, vx_next, vy_next = x_next[flying], y_next[flying], vx_next[flying], vy_next[flying]
+            x, y, vx, vy = x_next, y_next, vx_next, vy_next
+            t = t + dt
+        return impact_x.reshape(shape), impact_t.reshape(shape), impact_v.reshape(shape)
+
+    def _interpolate(self, ranges, times, velocities, v0: float) -> tuple:
+        """
+        Time and velocity every range_step km, from the results of a shell at each angle
+        """
+        # only angles that stay in max_range and go further than the one before
+        finite = np.isfinite(ranges)
+        stop = len(ranges) if finite.all() else int(np.argmin(finite))
+        shorter = np.diff(ranges[:stop]) <= 0
+        if shorter.any():
+            stop = int(np.argmax(shorter)) + 1
+        if stop == 0:
+            return None, None
+        reach = min(self.max_range, ranges[stop - 1] / 1000)
+        steps = np.arange(1, int(reach / self.range_step + 1e-9) + 1) * self.range_step * 1000
+        if len(steps) == 0:
+            return None, None
+
+        # it is at the muzzle at range 0
+        ranges = np.concatenate(([0.0], ranges[:stop]))
+        time = np.interp(steps, ranges, np.concatenate(([0.0], times[:stop])))
+        velocity = np.interp(steps, ranges, np.concatenate(([v0], velocities[:stop])))
+        return time, velocity
+
+    def tables(self, shells: list) -> list:
+        """
+        Get the tables of shells (artillery game params), None if a shell can't reach the first range step.
+        Every shell with the same diameter, mass, drag and velocity is only flown once.
+        """
+        if len(shells) == 0:
+            return []
+        inputs = np.array([[s['bulletDiametr'], s['bulletMass'], s['bulletAirDrag'], s['bulletSpeed']]
+                           for s in shells], dtype=float)
+        valid = (inputs > 0).all(axis=1)
+        unique, inverse = np.unique(inputs[valid], axis=0, return_inverse=True)
+        ranges, times, velocities = self.fly(*unique.T)
+
+        interpolated = [self._interpolate(ranges[i], times[i], velocities[i], unique[i][3]) for i in range(len(unique))]
+        tables = []
+        unique_index = iter(inverse.reshape(-1))
+        for shell, is_valid in zip(shells, valid):
+            if not is_valid:
+                tables.append(None)
+                continue
+            time, velocity = interpolated[next(unique_index)]
+            if time is None:
+                tables.append(None)
+                continue
+
+            table = {
+                'step': self.range_step,
+                'velocity': [round(v) for v in velocity.tolist()],
+                'time': [round(t / TIME_MULTIPLIER, 2) for t in time.tolist()],
+            }
+            if shell['ammoType'] == 'AP':
+                diameter = shell['bulletDiametr']
+                penetration = (PENETRATION * shell['bulletKrupp'] / 2400 * shell['bulletMass'] ** 0.55
+                               / (diameter * 1000) ** 0.65 * velocity ** 1.1)
+                table['penetration'] = [round(p) for p in penetration.tolist()]
+            tables.append(table)
+        return tables
@@ -0,0 +1,127 @@
+"""
+Time the range tables of ballistics.py against flying every shell one angle at a time in pure Python,
+which is what the app did for every shell it shows. Both use the same model, the largest difference is printed.
+Run it in scripts with game params, like python benchmarks/ballistics_loop.py [--repeat N] [GameParams-0.json]
+"""
+import math
+import os
+import sys
+import time
+
+# ballistics is in scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_codec
+from ballistics import CW_1, G, L, M, P0, PENETRATION, R, T0, TIME_MULTIPLIER, Ballistics
+
+
+def fly(ballistics: Ballistics, shell: dict, angle: float) -> tuple:
+    """
+    Range, time and impact velocity of shell at angle (degrees), range is inf beyond max_range
+    """
+    diameter = shell['bulletDiametr']
+    k = 0.5 * shell['bulletAirDrag'] * (diameter / 2) ** 2 * math.pi / shell['bulletMass']
+    cw_2 = 100 + 1000 / 3 * diameter
+    dt = ballistics.time_step
+    exponent = G * M / (R * L)
+    x = y = t = 0.0
+    vx = shell['bulletSpeed'] * math.cos(math.radians(angle))
+    vy = shell['bulletSpeed'] * math.sin(math.radians(angle))
+    while True:
+        temperature = T0 - L * y
+        density = P0 * (temperature / T0) ** exponent * M / (R * temperature)
+        drag_step = dt * k * density
+        x_next = x + dt * vx
+        y_next = y + dt * vy
+        vx_next = vx - drag_step * (CW_1 * vx * vx + cw_2 * vx)
+        vy_next = vy - dt * G - drag_step * (CW_1 * vy * abs(vy) + cw_2 * vy)
+        if y_next < 0:
+            f = y / (y - y_next)
+            return (x + f * (x_next - x), t + f * dt,
+                    math.hypot(vx + f * (vx_next - vx), vy + f * (vy_next - vy)))
+        if x_next > ballistics.max_range * 1000:
+            return math.inf, None, None
+        x, y, vx, vy = x_next, y_next, vx_next, vy_next
+        t += dt
+
+
+def table(ballistics: Ballistics, shell: dict) -> dict:
+    if min(shell['bulletDiametr'], shell['bulletMass'], shell['bulletAirDrag'], shell['bulletSpeed']) <= 0:
+        return None
+    # the muzzle, then every angle until one goes beyond max_range or not further than the one before
+    points = [(0.0, 0.0, shell['bulletSpeed'])]
+    for i in range(1, int(ballistics.max_angle / ballistics.angle_step) + 1):
+        point = fly(ballistics, shell, i * ballistics.angle_step)
+        if math.isinf(point[0]) or point[0] <= points[-1][0]:
+            break
+        points.append(point)
+
+    reach = min(ballistics.max_range, points[-1][0] / 1000)
+    result = {'step': ballistics.range_step, 'velocity': [], 'time': []}
+    for i in range(1, int(reach / ballistics.range_step + 1e-9) + 1):
+        distance = i * ballistics.range_step * 1000
+        j = 1
+        while j < len(points) - 1 and points[j][0] < distance:
+            j += 1
+        (x0, t0, v0), (x1, t1, v1) = points[j - 1], points[j]
+        f = (distance - x0) / (x1 - x0)
+        result['time'].append(round((t0 + f * (t1 - t0)) / TIME_MULTIPLIER, 2))
+        result['velocity'].append(v0 + f * (v1 - v0))
+    if len(result['time']) == 0:
+        return None
+
+    if shell['ammoType'] == 'AP':
+        result['penetration'] = [round(PENETRATION * shell['bulletKrupp'] / 2400 * shell['bulletMass'] ** 0.55
+                                       / (shell['bulletDiametr'] * 1000) ** 0.65 * v ** 1.1)
+                                 for v in result['velocity']]
+    result['velocity'] = [round(v) for v in result['velocity']]
+    return result
+
+
+def best_time(function, repeat: int) -> tuple:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def difference(a: dict, b: dict) -> float:
+    """
+    The largest difference of any value in two tables
+    """
+    if a is None or b is None:
+        return 0 if a is b else math.inf
+    largest = 0
+    for field in ['velocity', 'time', 'penetration']:
+        if (field in a) != (field in b) or len(a.get(field, [])) != len(b.get(field, [])):
+            return math.inf
+        for x, y in zip(a.get(field, []), b.get(field, [])):
+            largest = max(largest, abs(x - y))
+    return largest
+
+
+if __name__ == '__main__':
+    repeat = 3
+    if '--repeat' in sys.argv:
+        repeat = int(sys.argv[sys.argv.index('--repeat') + 1])
+    files = [arg for arg in sys.argv[1:] if arg.endswith('.json')]
+    filename = files[0] if len(files) > 0 else 'GameParams-0.json'
+
+    with open(filename, 'rb') as f:
+        params = json_codec.loads(f.read())
+    if isinstance(params, list):
+        params = params[0]
+    shells = [item for item in params.values() if isinstance(item, dict) and 'typeinfo' in item
+              and item['typeinfo']['type'] == 'Projectile' and item['typeinfo']['species'] == 'Artillery']
+    del params
+    unique = len({(s['bulletDiametr'], s['bulletMass'], s['bulletAirDrag'], s['bulletSpeed']) for s in shells})
+    print('{} artillery shells, {} different trajectories'.format(len(shells), unique))
+
+    ballistics = Ballistics()
+    vectorized, tables = best_time(lambda: ballistics.tables(shells), repeat)
+    loop, loop_tables = best_time(lambda: [table(ballistics, shell) for shell in shells], repeat)
+    print('numpy {:.3f}s, loop {:.3f}s, {:.1f}x faster'.format(vectorized, loop, loop / vectorized))
+    print('Largest difference {:g}'.format(max([difference(a, b) for a, b in zip(tables, loop_tables)] + [0])))
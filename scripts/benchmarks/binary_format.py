@@ -0,0 +1,91 @@
+"""
+Compare loading wowsinfo.json with json.load against reading wowsinfo.bin, each case runs in its own process
+so resident memory isn't shared. Run it in scripts after generating everything, like
+python benchmarks/binary_format.py [wowsinfo.json] [wowsinfo.bin]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# wowsinfo_bin is in scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from wowsinfo_bin import WoWsInfoReader
+
+CASES = {
+    'json.load': 'load everything from json',
+    'bin_open': 'only read the index',
+    'bin_ship': 'read a single ship',
+    'bin_ship_list': 'read the name and tier of every ship',
+    'bin_all': 'read everything',
+}
+
+
+def resident_memory() -> int:
+    """
+    Resident memory of this process in bytes, 0 if it is not available
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def run_case(case: str, json_file: str, bin_file: str):
+    rss_before = resident_memory()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    if case == 'json.load':
+        with open(json_file, 'r', encoding='utf8') as f:
+            result = json.load(f)
+    else:
+        reader = WoWsInfoReader(bin_file)
+        if case == 'bin_ship':
+            ships = reader.section('ships')
+            result = ships[next(iter(ships))]
+        elif case == 'bin_ship_list':
+            ships = reader.section('ships')
+            result = [(ships[key]['name'], ships[key]['tier']) for key in ships]
+        elif case == 'bin_all':
+            result = reader.to_dict()
+        else:
+            result = reader
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({'time': elapsed, 'peak': peak, 'rss': resident_memory() - rss_before}))
+
+
+if __name__ == '__main__':
+    if '--case' in sys.argv:
+        run_case(sys.argv[sys.argv.index('--case') + 1], sys.argv[1], sys.argv[2])
+        sys.exit(0)
+
+    json_file = sys.argv[1] if len(sys.argv) > 1 else 'wowsinfo.json'
+    bin_file = sys.argv[2] if len(sys.argv) > 2 else 'wowsinfo.bin'
+    print('{} {:.2f} MB, {} {:.2f} MB'.format(json_file, os.path.getsize(json_file) / 1024 / 1024,
+                                              bin_file, os.path.getsize(bin_file) / 1024 / 1024))
+
+    # make sure nothing is lost first
+    with open(json_file, 'r', encoding='utf8') as f:
+        expected = json.load(f)
+    with WoWsInfoReader(bin_file) as reader:
+        if reader.to_dict() != expected:
+            raise Exception('{} is not the same as {}'.format(bin_file, json_file))
+    del expected
+    print('Round trip is lossless')
+
+    for case, description in CASES.items():
+        output = subprocess.run([sys.executable, __file__, json_file, bin_file, '--case', case],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        print('{:<14} {:.3f}s, peak {:.2f} MB, resident {:.2f} MB ({})'.format(
+            case, result['time'], result['peak'] / 1024 / 1024, result['rss'] / 1024 / 1024, description))
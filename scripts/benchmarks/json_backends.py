@@ -0,0 +1,64 @@
+"""
+Time reading and writing GameParams-0.json, wowsinfo.json and lang.json with every json backend that is installed.
+Run it in scripts after generating everything, like python benchmarks/json_backends.py [--repeat N] [files...]
+"""
+import os
+import sys
+import time
+
+# json_codec is in scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_codec
+
+DEFAULT_FILES = ['GameParams-0.json', 'wowsinfo.json', 'lang.json']
+
+
+def best_time(function, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def benchmark(filename: str, repeat: int) -> list:
+    """
+    Parse, dump and fast dump time of filename with each backend
+    """
+    with open(filename, 'rb') as f:
+        raw = f.read()
+
+    results = []
+    for name in json_codec.BACKENDS:
+        json_codec.use_backend(name)
+        data = json_codec.loads(raw)
+        results.append({
+            'backend': name,
+            'parse': best_time(lambda: json_codec.loads(raw), repeat),
+            'dump': best_time(lambda: json_codec.dumps(data), repeat),
+            'fast_dump': best_time(lambda: json_codec.fast_dumps(data), repeat),
+        })
+    return results
+
+
+if __name__ == '__main__':
+    repeat = 3
+    if '--repeat' in sys.argv:
+        repeat = int(sys.argv[sys.argv.index('--repeat') + 1])
+    files = [arg for arg in sys.argv[1:] if arg.endswith('.json')] or DEFAULT_FILES
+
+    default_backend = json_codec.backend
+    for filename in files:
+        if not os.path.exists(filename):
+            print('{} not found, skipped'.format(filename))
+            continue
+        print('{} ({:.2f} MB)'.format(filename, os.path.getsize(filename) / 1024 / 1024))
+        for result in benchmark(filename, repeat):
+            print('  {:<8} parse {:.3f}s, dump {:.3f}s, fast dump {:.3f}s'.format(
+                result['backend'], result['parse'], result['dump'], result['fast_dump']))
+    json_codec.use_backend(default_backend)
+    # dump always uses json so the output doesn't depend on the backend
+    print('Default backend: {}'.format(default_backend))
@@ -0,0 +1,141 @@
+"""
+Time read() and generate() on synthetic game params at 1x, 5x and 20x the size of the live game, see synthetic.py.
+Every scale runs twice in its own process, once for time and once with tracemalloc for peak memory
+since tracing slows everything down. Run it in scripts like
+python benchmarks/scaling.py [--scales 1,5,20] [--output scaling.json] [--baseline scaling.json]
+With --baseline, it fails if anything is more than THRESHOLD slower or bigger than the baseline.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import synthetic
+
+# generate is in scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SCALES = [1, 5, 20]
+STAGES = ['read', 'generate']
+THRESHOLD = 0.2
+
+
+def run_case(directory: str, memory: bool) -> dict:
+    """
+    Read and generate everything in directory, return the time and peak memory of each stage
+    """
+    from generate import WoWsGenerate
+
+    os.chdir(directory)
+    result = {}
+    if memory:
+        tracemalloc.start()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        generator = WoWsGenerate()
+        for stage in STAGES:
+            if memory:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            if stage == 'read':
+                generator.read(cache=False)
+            else:
+                generator.generate(directory)
+            result[stage] = {'time': time.perf_counter() - start}
+            if memory:
+                result[stage]['peak'] = tracemalloc.get_traced_memory()[1]
+    if memory:
+        tracemalloc.stop()
+    return result
+
+
+def benchmark(scale: float) -> dict:
+    """
+    Build synthetic game params at scale and measure them, the files are removed after.
+    If a process fails, like when it runs out of memory, error has why and the rest is missing.
+    """
+    directory = tempfile.mkdtemp(prefix='wowsinfo_scaling_')
+    try:
+        sizes = synthetic.build(directory, scale)
+        result = {'scale': scale, 'size': sizes['GameParams-0.json']}
+        for memory in [False, True]:
+            command = [sys.executable, __file__, '--case', directory]
+            if memory:
+                command.append('--memory')
+            process = subprocess.run(command, capture_output=True, text=True)
+            if process.returncode != 0:
+                lines = process.stderr.strip().splitlines()
+                result['error'] = '{} exited with {}{}'.format(
+                    'memory' if memory else 'time', process.returncode, ': ' + lines[-1] if len(lines) > 0 else '')
+                break
+            for stage, values in json.loads(process.stdout).items():
+                # tracing slows everything down, only its peak is kept
+                result.setdefault(stage, {}).update({'peak': values['peak']} if memory else values)
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def compare(results: list, baseline: list) -> list:
+    """
+    Everything that is more than THRESHOLD worse than the baseline of the same scale
+    """
+    regressions = []
+    previous = {entry['scale']: entry for entry in baseline}
+    for result in results:
+        before = previous.get(result['scale'])
+        if before is None or 'error' in before:
+            continue
+        if 'error' in result:
+            regressions.append('{}x {}'.format(result['scale'], result['error']))
+            continue
+        for stage in STAGES:
+            for field in ['time', 'peak']:
+                old = before[stage][field]
+                new = result[stage][field]
+                if old > 0 and new > old * (1 + THRESHOLD):
+                    regressions.append('{}x {} {}: {:.3f} -> {:.3f} ({:+.0%})'.format(
+                        result['scale'], stage, field, old, new, new / old - 1))
+    return regressions
+
+
+if __name__ == '__main__':
+    if '--case' in sys.argv:
+        print(json.dumps(run_case(sys.argv[sys.argv.index('--case') + 1], '--memory' in sys.argv)))
+        sys.exit(0)
+
+    scales = DEFAULT_SCALES
+    if '--scales' in sys.argv:
+        scales = [float(scale) for scale in sys.argv[sys.argv.index('--scales') + 1].split(',')]
+
+    results = []
+    for scale in scales:
+        result = benchmark(scale)
+        results.append(result)
+        print('{:g}x, game params {:.2f} MB'.format(scale, result['size'] / 1024 / 1024))
+        for stage in STAGES:
+            if stage not in result:
+                continue
+            line = '  {:<8} {:.3f}s'.format(stage, result[stage]['time'])
+            if 'peak' in result[stage]:
+                line += ', peak {:.2f} MB'.format(result[stage]['peak'] / 1024 / 1024)
+            print(line)
+        if 'error' in result:
+            print('  failed, {}'.format(result['error']))
+
+    if '--output' in sys.argv:
+        filename = sys.argv[sys.argv.index('--output') + 1]
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=2)
+        print('Results written to {}'.format(filename))
+
+    if '--baseline' in sys.argv:
+        with open(sys.argv[sys.argv.index('--baseline') + 1], 'r') as f:
+            regressions = compare(results, json.load(f))
+        if len(regressions) > 0:
+            raise Exception('Slower or bigger than the baseline:\n' + '\n'.join(regressions))
+        print('No regressions')
@@ -0,0 +1,415 @@
+"""
+Write a synthetic GameParams-0.json, langs/*_lang.json and game_info.xml so the generator can run without the game.
+Everything the generator reads is there and valid, values are made up. Run it like
+python benchmarks/synthetic.py <folder> [--scale 1] [--ships N] [--shells N] ... [--modules N] [--seed N]
+Every count in REAL_SIZE and SHAPE can be set like --ships, --scale multiplies the counts in REAL_SIZE.
+"""
+import json
+import os
+import random
+
+# about how many entries of each kind the live game has, --scale multiplies all of them
+REAL_SIZE = {
+    'ships': 800,
+    # artillery shells, ships have their own and the rest are like shells of removed or event ships
+    'shells': 6000,
+    'torpedoes': 600,
+    'aircrafts': 1500,
+    'consumables': 600,
+    'modernizations': 150,
+    'exteriors': 4000,
+    'achievements': 400,
+    'crews': 300,
+    'dog_tags': 2000,
+}
+# how each entry looks, this doesn't change with --scale
+SHAPE = {
+    # units in ShipUpgradeInfo of each ship
+    'modules': 7,
+    # auras in each air defense component
+    'auras': 3,
+    # ability slots of each ship
+    'abilities': 4,
+}
+LANGUAGES = ['en', 'ja', 'zh_sg', 'zh_tw', 'ru']
+NATIONS = ['Japan', 'USA', 'Germany', 'France', 'United_Kingdom', 'Russia', 'Italy', 'Pan_Asia']
+SPECIES = ['Battleship', 'Cruiser', 'Destroyer', 'AirCarrier']
+CONSUMABLES = ['CrashCrew', 'SmokeGenerator', 'ArtilleryBooster', 'Fighter', 'RegenCrew', 'SpeedBooster', 'Sonar', 'RLS']
+AIRCRAFTS = ['Dive', 'Bomber', 'Scout', 'Airship', 'Fighter']
+AURA_TYPES = ['near', 'medium', 'far']
+# unit types and the component each of them changes, hulls change everything else
+UNIT_TYPES = [('_Hull', 'hull'), ('_Suo', 'fireControl'), ('_Engine', 'engine')]
+# how many ships share their guns, shells, air defense and hulls with an earlier ship, like sister ships
+SHARED = 0.3
+# calibers (m) and muzzle velocities (m/s) of shells
+CALIBERS = [0.076, 0.088, 0.1, 0.105, 0.114, 0.12, 0.127, 0.13, 0.138, 0.14, 0.15, 0.152, 0.155, 0.18, 0.203,
+            0.21, 0.234, 0.24, 0.254, 0.283, 0.305, 0.33, 0.343, 0.356, 0.38, 0.406, 0.42, 0.457, 0.46, 0.51]
+VELOCITY = (700, 1000)
+
+
+class SyntheticGameParams:
+    """
+    Build game params and language tables in memory, write them with write()
+    """
+
+    def __init__(self, seed: int = 0, **size):
+        size = dict(REAL_SIZE, **SHAPE, **size)
+        if size['modules'] < len(UNIT_TYPES) or min(size.values()) < 1:
+            raise Exception('At least 1 of everything and {} modules are needed'.format(len(UNIT_TYPES)))
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._size = size
+        self._params = {}
+        self._langs = {lang: {} for lang in LANGUAGES}
+        self._id = 3000000
+        # component sets of ships, ships that don't share get a new one
+        self._variants = 0
+
+    def _new_id(self) -> int:
+        self._id += 1
+        return self._id
+
+    def _add(self, key: str, type_name: str, type_nation: str, type_species, **values) -> dict:
+        item = {'typeinfo': {'type': type_name, 'nation': type_nation, 'species': type_species}, 'id': self._new_id()}
+        item.update(values)
+        self._params[key] = item
+        return item
+
+    def _lang(self, key: str, text: str):
+        for lang, table in self._langs.items():
+            table[key] = text if lang == 'en' else '{} ({})'.format(text, lang)
+
+    #region game params
+    def _shells(self, count: int) -> list:
+        """
+        count shells of every ammo type, every one of them has its own caliber, mass and velocity
+        """
+        shells = []
+        for i in range(count):
+            ammo = ['AP', 'HE', 'CS'][i % 3]
+            key = 'PAPA{:05d}_{}'.format(i, ammo)
+            diameter = self._random.choice(CALIBERS)
+            self._add(key, 'Projectile', self._random.choice(NATIONS), 'Artillery',
+                      ammoType=ammo, bulletSpeed=float(self._random.randint(*VELOCITY)),
+                      # about how heavy real shells of a caliber are
+                      bulletMass=round(diameter ** 3 * self._random.uniform(13000, 16000), 1),
+                      alphaPiercingCS=30 if ammo == 'CS' else 0, alphaPiercingHE=20 if ammo == 'HE' else 0,
+                      alphaDamage=float(round(diameter * 25000, -2)), burnProb=0.1 if ammo == 'HE' else 0,
+                      bulletRicochetAt=91 if ammo == 'HE' else 45, bulletAlwaysRicochetAt=60,
+                      bulletDiametr=diameter, bulletAirDrag=round(self._random.uniform(0.25, 0.35), 3),
+                      bulletKrupp=float(self._random.randint(2000, 2600)), bulletDetonator=0.033)
+            self._lang('IDS_' + key.upper(), 'Shell {}'.format(key))
+            shells.append(key)
+        return shells
+
+    def _torpedoes(self) -> list:
+        torpedoes = []
+        count = self._size['torpedoes']
+        for i in range(count):
+            key = 'PJPT{:04d}'.format(i)
+            deep_water = i % 10 == 9
+            self._add(key, 'Projectile', NATIONS[i % len(NATIONS)], 'Torpedo', speed=50.0 + i % 30,
+                      visibilityFactor=1.0 + i % 10 / 10, maxDist=300.0 + i % 20 * 20, uwCritical=0.3,
+                      alphaDamage=10000.0 + i % 50 * 1000, damage=2000.0, isDeepWater=deep_water,
+                      ignoreClasses=['Destroyer'] if deep_water else [])
+            self._lang('IDS_' + key, 'Torpedo {}'.format(i))
+            torpedoes.append(key)
+        self._add('PXPM001', 'Projectile', 'Common', 'Mine')
+        for i in range(2):
+            self._add('PAPD{:03d}'.format(i), 'Projectile', 'USA', 'DepthCharge',
+                      alphaDamage=5000.0, burnProb=0.0, uwCritical=0.5)
+        return torpedoes
+
+    def _consumables(self, fighter: str) -> list:
+        consumables = []
+        for i in range(self._size['consumables']):
+            name = CONSUMABLES[i % len(CONSUMABLES)]
+            key = 'PCY{:04d}_{}'.format(i, name)
+            default = {'consumableType': name.lower(), 'workTime': 5.0 + i % 20, 'reloadTime': 60.0 + i % 90,
+                       'numConsumables': -1, 'SpecialSoundID': None, 'group': 'x', 'preparationTime': 0,
+                       'descIDs': '', 'titleIDs': '', 'boostCoeff': 0.5, 'iconIDs': name + 'Premium' if i % 2 else '',
+                       'fightersName': fighter if name == 'Fighter' else ''}
+            premium = dict(default, workTime=default['workTime'] + 3, reloadTime=default['reloadTime'] - 20,
+                           numConsumables=3)
+            self._add(key, 'Ability', 'Common', None, costCR=0, costGold=0, Default=default, Premium=premium)
+            self._lang('IDS_DOCK_CONSUME_TITLE_' + key.upper(), name)
+            self._lang('IDS_DOCK_CONSUME_DESCRIPTION_' + key.upper(), name + ' description')
+            consumables.append(key)
+        for name in CONSUMABLES:
+            self._lang('IDS_BATTLEHINT_TYPE_CONSUMABLE_' + name.upper(), name + ' hint')
+        return consumables
+
+    def _aircraft_key(self, i: int) -> str:
+        return 'PAUD{:04d}'.format(i)
+
+    def _aircrafts(self, shells: list, consumables: list):
+        for i in range(self._size['aircrafts']):
+            key = self._aircraft_key(i)
+            species = AIRCRAFTS[i % len(AIRCRAFTS)]
+            self._add(key, 'Aircraft', NATIONS[i % len(NATIONS)], species,
+                      hangarSettings={'maxValue': 4 if species in ['Dive', 'Bomber'] else 0, 'timeToRestore': 60.0},
+                      maxHealth=1000 + i % 20 * 50, numPlanesInSquadron=6, visibilityFactor=10.0,
+                      speedMoveWithBomb=140.0, attackerSize=2, attackCount=1, attackCooldown=5.0, speedMin=100.0,
+                      speedMax=180.0, maxForsageAmount=10.0, forsageRegeneration=0.5 if species == 'Dive' else 0,
+                      bombName=shells[i % len(shells)],
+                      PlaneAbilities={'AbilitySlot0': {'abils': [[consumables[i % len(consumables)], 'Default']]}})
+            self._lang('IDS_' + key, 'Aircraft {}'.format(i))
+
+    def _air_defense(self, variant: int) -> dict:
+        air_defense = {}
+        for i in range(12):
+            air_defense['AA_{}'.format(i)] = {'name': 'AAGM{:03d}'.format((variant + i) % 60),
+                                              'numBarrels': float(1 + (variant + i) % 4), 'shotDelay': 0.5}
+        for i in range(self._size['auras']):
+            aura_type = AURA_TYPES[i % len(AURA_TYPES)]
+            # Far, Med and Near in the key decide where it goes
+            key = 'Aura{}{}'.format({'near': 'Near', 'medium': 'Med', 'far': 'Far'}[aura_type], i)
+            guns = ['AA_{}'.format(g) for g in range(i % 12, 12, len(AURA_TYPES))]
+            air_defense[key] = {'type': aura_type, 'minDistance': 0.0, 'maxDistance': 2000.0 + 1500.0 * (i % 3),
+                                'areaDamage': 50.0 + variant % 200 + i, 'areaDamagePeriod': 0.285, 'hitChance': 0.7,
+                                'guns': guns}
+        return air_defense
+
+    def _ship_components(self, species: str, variant: int, shells: list, torpedoes: list) -> dict:
+        """
+        Components of a new variant, every variant has its own guns, shells, air defense and hulls
+        """
+        values = random.Random(self._seed * 1000003 + variant)
+        # AP and HE of the main battery, HE of secondaries
+        main = variant * 3 % len(shells)
+        ammo = [shells[main], shells[(main + 1) % len(shells)]]
+        gun = {'shotDelay': float(values.randint(3, 35)), 'rotationSpeed': [values.choice([3.0, 4.0, 6.0, 10.0])] * 2,
+               'numBarrels': float(values.randint(1, 4)), 'ammoList': ammo, 'vertSector': [-5.0, 45.0],
+               'name': 'AGM{:05d}'.format(variant)}
+        artillery = {'maxDist': float(values.randint(8, 26) * 1000), 'sigmaCount': values.choice([1.8, 2.0, 2.05]),
+                     'HP_AGM_1': dict(gun), 'HP_AGM_2': dict(gun), 'HP_AGM_3': dict(gun, numBarrels=2.0),
+                     'AuraFar': {'type': 'far', 'minDistance': 3500.0, 'maxDistance': 5800.0, 'areaDamage': 0,
+                                 'innerBubbleCount': 5.0, 'outerBubbleCount': 2.0, 'shotDelay': 2.0, 'hitChance': 1.0,
+                                 'shotTravelTime': 0.5, 'bubbleDamage': 1400.0, 'guns': []}}
+        secondary = {'shotDelay': float(values.randint(3, 8)), 'rotationSpeed': [10.0, 10.0], 'numBarrels': 2.0,
+                     'ammoList': [shells[(main + 4) % len(shells)]], 'name': 'ASEC{:03d}'.format(variant % 40)}
+        atba = {'maxDist': float(values.randint(4, 8) * 1000), 'sigmaCount': 1.0}
+        for i in range(values.randint(4, 20)):
+            atba['HP_SEC_{}'.format(i)] = dict(secondary, shotDelay=secondary['shotDelay'] + i % 2)
+        atba['AuraMed'] = {'type': 'medium', 'minDistance': 0.0, 'maxDistance': 5000.0, 'areaDamage': 70.0,
+                           'areaDamagePeriod': 0.285, 'hitChance': 0.75, 'guns': ['HP_SEC_0', 'HP_SEC_1', 'HP_SEC_2']}
+        hull = {'health': float(values.randint(100, 900) * 100), 'floodNodes': [[0.2, 1.0, 1.0]],
+                'visibilityFactor': values.randint(60, 180) / 10, 'visibilityFactorByPlane': 10.2,
+                'visibilityCoefFire': 3.0, 'visibilityCoefFireByPlane': 4.0,
+                'visibilityFactorsBySubmarine': {'PERISCOPE': 10.2}, 'visibilityCoefGKInSmoke': 12.0,
+                'visibilityCoefGKByPlane': 10.2, 'maxSpeed': float(values.randint(27, 42)),
+                'turningRadius': float(values.randint(5, 10) * 100), 'rudderTime': values.randint(50, 200) / 10}
+        launcher = {'shotDelay': float(values.randint(60, 150)), 'rotationSpeed': [25.0, 25.0],
+                    'numBarrels': float(values.randint(2, 5)), 'ammoList': [torpedoes[variant % len(torpedoes)]]}
+
+        components = {
+            'A_Hull': hull, 'B_Hull': dict(hull, health=hull['health'] + 5000),
+            'A_Artillery': artillery, 'A_ATBA': atba,
+            'A_AirDefense': self._air_defense(variant), 'B_AirDefense': self._air_defense(variant + 1),
+            'A_FireControl': {'maxDistCoef': 1.0, 'sigmaCountCoef': 1.0},
+            'B_FireControl': {'maxDistCoef': 1.1, 'sigmaCountCoef': 1.0},
+            'A_Engine': {'speedCoef': 0.0}, 'B_Engine': {'speedCoef': 0.05},
+            'A_Specials': {'RageMode': {'decrementCount': 1}} if variant % 20 == 19 else {},
+        }
+        if species == 'Destroyer':
+            components['A_Torpedoes'] = {'useOneShot': False, 'HP_JGT_1': dict(launcher), 'HP_JGT_2': dict(launcher)}
+            components['A_DepthCharges'] = {'reloadTime': 40.0, 'numShots': 2, 'maxPacks': 2,
+                                            'L1': {'ammoList': ['PAPD000'], 'numBombs': 3},
+                                            'L2': {'ammoList': ['PAPD001'], 'numBombs': 2}}
+        if species == 'Cruiser':
+            components['A_AirSupport'] = {'planeName': self._aircraft_key(2), 'reloadTime': 60.0, 'maxDist': 9000.0,
+                                          'chargesNum': 2}
+        self._lang('IDS_AGM{:05d}'.format(variant), 'Gun {}'.format(variant))
+        return components
+
+    def _upgrade_info(self, index: str, nation: str, components: dict, next_ship: str) -> dict:
+        upgrade_info = {'costXP': 100000, 'costGold': 0, 'costCR': 10000000, 'lockedConfig': []}
+        empty = {'hull': [], 'artillery': [], 'atba': [], 'torpedoes': [], 'airDefense': [], 'fireControl': [],
+                 'engine': [], 'depthCharges': [], 'airSupport': [], 'specials': [], 'directors': []}
+        last = {}
+        for i in range(self._size['modules']):
+            unit_type, component_type = UNIT_TYPES[i % len(UNIT_TYPES)]
+            position = i // len(UNIT_TYPES)
+            # A_ for the first unit of each type, B_ for the ones after
+            letter = 'A' if position == 0 else 'B'
+            unit_components = dict(empty)
+            if unit_type == '_Hull':
+                unit_components.update(hull=[letter + '_Hull'], artillery=['A_Artillery'], atba=['A_ATBA'],
+                                       airDefense=[letter + '_AirDefense'])
+                for name, slot in [('A_Torpedoes', 'torpedoes'), ('A_DepthCharges', 'depthCharges'),
+                                   ('A_AirSupport', 'airSupport'), ('A_Specials', 'specials')]:
+                    if name in components and (position == 0 or name == 'A_Torpedoes'):
+                        unit_components[slot] = [name]
+            else:
+                unit_components[component_type] = ['{}_{}'.format(letter, component_type[0].upper() + component_type[1:])]
+
+            key = '{}_{}{}'.format(index.replace('S', 'U', 1), unit_type.strip('_'), position)
+            self._add(key, 'Unit', nation, unit_type, costCR=1000 * i, costXP=500 * i)
+            self._lang('IDS_' + key.upper(), '{} {}'.format(unit_type.strip('_'), position))
+            upgrade_info[key] = {
+                'ucType': unit_type,
+                'prev': last.get(unit_type, ''),
+                'components': unit_components,
+                # PRSD309_Pr_48 is deleted in the real game as well
+                'nextShips': [next_ship, 'PRSD309_Pr_48'] if next_ship is not None and i == 0 else [],
+            }
+            last[unit_type] = key
+        return upgrade_info
+
+    def _add_ships(self, shells: list, torpedoes: list, consumables: list) -> list:
+        keys = ['P{}S{:05d}_Ship{}'.format(NATIONS[s % len(NATIONS)][0], s, s) for s in range(self._size['ships'])]
+        # the components of each variant, species is part of them
+        variants = {}
+        for s, key in enumerate(keys):
+            nation = NATIONS[s % len(NATIONS)]
+            index = key.split('_')[0]
+            if self._variants > 0 and self._random.random() < SHARED:
+                variant = self._random.randrange(self._variants)
+                species, components = variants[variant]
+            else:
+                variant = self._variants
+                self._variants += 1
+                species = SPECIES[s % len(SPECIES)]
+                components = self._ship_components(species, variant, shells, torpedoes)
+                variants[variant] = (species, components)
+
+            abilities = {}
+            for slot in range(self._size['abilities']):
+                consumable = consumables[(s + slot) % len(consumables)]
+                abilities['AbilitySlot{}'.format(slot)] = {'abils': [[consumable, 'Default'], [consumable, 'Premium']]}
+            # the same nation a few tiers later
+            next_index = s + len(NATIONS)
+            next_ship = keys[next_index] if next_index < len(keys) else None
+
+            ship = self._add(key, 'Ship', nation, species, index=index, name=key, isPaperShip=s % 7 == 0,
+                             level=1 + s % 11, group='upgradeable',
+                             permoflages=['PCEM{:04d}'.format(s)] if s % 3 else [], ShipAbilities=abilities)
+            ship.update(components)
+            ship['ShipUpgradeInfo'] = self._upgrade_info(index, nation, components, next_ship)
+
+            self._lang('IDS_' + index.upper(), 'Ship {}'.format(s))
+            self._lang('IDS_' + index.upper() + '_DESCR', 'Description of ship {}'.format(s))
+            self._lang('IDS_' + index.upper() + '_YEAR', str(1900 + s % 100))
+        for i in range(60):
+            self._lang('IDS_AAGM{:03d}'.format(i), 'AA gun {}'.format(i))
+        for i in range(40):
+            self._lang('IDS_ASEC{:03d}'.format(i), 'Secondary gun {}'.format(i))
+        for name in NATIONS + SPECIES:
+            self._lang('IDS_' + name.upper(), name)
+        return keys
+
+    def _crews(self):
+        self._add('PAW001_DefaultCrew', 'Crew', 'Common', None, CrewPersonality={'isUnique': False},
+                  Skills={'AaPrioritysectorDamage': {'modifiers': {'aaDmg': 1.1}, 'tier': 1},
+                          'ArtilleryAlertness': {'modifiers': {'alert': 1}, 'tier': 2}})
+        self._lang('IDS_SKILL_AA_PRIORITYSECTOR_DAMAGE', 'Priority sector')
+        for i in range(self._size['crews']):
+            self._add('PAW{:04d}_Crew'.format(i + 2), 'Crew', 'Common', None, CrewPersonality={'isUnique': i % 3 == 1},
+                      Skills={'AaPrioritysectorDamage': {'modifiers': {'aaDmg': 1.1 + i, 'crewExtra{}'.format(i): 2}}})
+
+    def _modernizations(self, ships: list):
+        for i in range(self._size['modernizations']):
+            key = 'PCM{:04d}_Mod{}'.format(i, i)
+            self._add(key, 'Modernization', 'Common', None, slot=i % 7 - 1, name=key, costCR=125000,
+                      tags=['unique'] if i % 6 == 2 else (['special'] if i % 6 == 3 else []),
+                      shiplevel=[8, 9, 10] if i % 2 else [], shiptype=['Cruiser'] if i % 6 == 4 else [],
+                      nation=['Japan'] if i % 6 == 5 else [],
+                      modifiers={'GMShotDelay': 0.9 + i % 10 / 100, 'visibilityDistCoeff': 0.9},
+                      ships=ships[i:i + 5] + ['PXXX_Deleted'], excludes=ships[-(i % 5):] if i % 5 else [])
+            self._lang('IDS_TITLE_' + key.upper(), 'Modernization {}'.format(i))
+            self._lang('IDS_DESC_' + key.upper(), 'Modernization description {}'.format(i))
+
+    def _exteriors(self):
+        species = ['Flags', 'Camouflage', 'Ensign', 'Permoflage']
+        for i in range(self._size['exteriors']):
+            key = 'PCEF{:05d}_Flag'.format(i)
+            self._add(key, 'Exterior', 'Common', species[i % len(species)], costCR=-1 if i % 4 == 1 else 1000,
+                      costGold=50, modifiers={'GMShotDelay': 0.95} if i % 4 == 0 else {}, name=key)
+            self._lang('IDS_' + key.upper(), 'Exterior {}'.format(i))
+            self._lang('IDS_' + key.upper() + '_DESCRIPTION', 'Exterior description {}'.format(i))
+        for i in range(3):
+            self._add('PCEC{:03d}_Boost'.format(i), 'Exterior', 'Common', 'Camoboost', costCR=0, costGold=0,
+                      modifiers={'expCoeff': 1.5}, name='CAMOBOOST_{}'.format(i))
+            self._lang('IDS_CAMOBOOST_{}'.format(i), 'Camoboost {}'.format(i))
+
+    def _others(self):
+        for i in range(self._size['achievements']):
+            self._add('PCA{:04d}_Ach'.format(i), 'Achievement', 'Common', None, uiName='ach_{}'.format(i),
+                      battleTypes=['RandomBattle'], constants={'x': i})
+            self._lang('IDS_ACHIEVEMENT_ACH_{}'.format(i), 'Achievement {}'.format(i))
+        for i in range(self._size['dog_tags']):
+            self._add('PDT{:04d}'.format(i), 'DogTag', 'Common', None, index='DT{}'.format(i))
+        self._add('PAGM001', 'Gun', 'Common', 'Main')
+        for modifier in ['aaDmg', 'GMShotDelay', 'alert']:
+            self._lang('IDS_PARAMS_MODIFIER_' + modifier.upper(), 'Modifier ' + modifier)
+        for key in ['IDS_MODULE_TYPE_ARTILLERY', 'IDS_SHIP_PARAM_X', 'IDS_CAROUSEL_APPLIED_Y', 'IDS_DOCK_RAGE_MODE_Z',
+                    'IDS_SPECTATE_SWITCH_SHIP', 'IDS_MODERNIZATIONS', 'IDS_SECOND', 'IDS_SHIPS', 'IDS_BATTLES',
+                    'IDS_KNOT']:
+            self._lang(key, key.lower())
+        # most of the language file is not used by the generator
+        for i in range(self._size['ships'] * 50):
+            self._lang('IDS_UNUSED_{}'.format(i), 'Unused text {}'.format(i))
+    #endregion
+
+    def build(self) -> 'SyntheticGameParams':
+        # every ship that doesn't share has its own AP, HE and secondary shells
+        shells = self._shells(max(self._size['shells'], self._size['ships'] * 3))
+        torpedoes = self._torpedoes()
+        # the first fighter
+        consumables = self._consumables(self._aircraft_key(AIRCRAFTS.index('Fighter')))
+        self._aircrafts(shells, consumables)
+        ships = self._add_ships(shells, torpedoes, consumables)
+        self._crews()
+        self._modernizations(ships)
+        self._exteriors()
+        self._others()
+        return self
+
+    def write(self, directory: str) -> dict:
+        """
+        Write everything to directory and return the size of each file in bytes
+        """
+        os.makedirs(os.path.join(directory, 'langs'), exist_ok=True)
+        sizes = {}
+        filename = os.path.join(directory, 'GameParams-0.json')
+        with open(filename, 'w', encoding='utf8') as f:
+            json.dump(self._params, f)
+        sizes['GameParams-0.json'] = os.path.getsize(filename)
+        for lang, table in self._langs.items():
+            filename = os.path.join(directory, 'langs', '{}_lang.json'.format(lang))
+            with open(filename, 'w', encoding='utf8') as f:
+                json.dump(table, f, ensure_ascii=False)
+            sizes['langs/{}_lang.json'.format(lang)] = os.path.getsize(filename)
+        with open(os.path.join(directory, 'game_info.xml'), 'w') as f:
+            f.write('<protocol><game><id>WOWS.WW.PRODUCTION</id></game>'
+                    '<version name="client" available="0.11.8.0.1" installed="0.11.8.0.1"/></protocol>')
+        return sizes
+
+
+def build(directory: str, scale: float = 1, seed: int = 0, **size) -> dict:
+    """
+    Write synthetic game files to directory, every count is REAL_SIZE * scale unless size has it.
+    Returns the size of each file in bytes.
+    """
+    options = {name: max(1, int(count * scale)) for name, count in REAL_SIZE.items()}
+    options.update(size)
+    return SyntheticGameParams(seed=seed, **options).build().write(directory)
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 2:
+        raise Exception('Usage: %s <folder> [--scale 1] [--ships N] [--shells N] ... [--modules N] [--seed N]'
+                        % sys.argv[0])
+    scale = 1
+    if '--scale' in sys.argv:
+        scale = float(sys.argv[sys.argv.index('--scale') + 1])
+    seed = 0
+    if '--seed' in sys.argv:
+        seed = int(sys.argv[sys.argv.index('--seed') + 1])
+    size = {}
+    for name in list(REAL_SIZE) + list(SHAPE):
+        if '--' + name.replace('_', '-') in sys.argv:
+            size[name] = int(sys.argv[sys.argv.index('--' + name.replace('_', '-')) + 1])
+    for filename, file_size in build(sys.argv[1], scale, seed, **size).items():
+        print('{}: {:.2f} MB'.format(filename, file_size / 1024 / 1024))
@@ -1,77 +1,135 @@
 """
-Compare wowsinfo.json with wowsinfo.json.bak and check if there are new items.
-Set `new` to true if it is a new item. Remove `new` if it is not a new item.
+Compare wowsinfo.json with wowsinfo.json.live or wowsinfo.json.pt and check if there are new, removed or changed items.
+New items are written to added.json instead of setting `added` in wowsinfo.json, so it doesn't have to be written again.
+changes.log only has new and removed items and how many items changed in each section, it is used for commit messages.
+Every changed field is written to changes_detail.log and patch.json can turn the backup into the new wowsinfo.json.
 """
 
-import json
 import os
 
+import json_codec
+from wowsinfo_diff import changed_items, diff, format_report, make_patch
 
-def compare_new(public_test: bool) -> None:
-    # make sure both wowsinfo.json and wowsinfo.json.bak exist
-    if not os.path.isfile('wowsinfo.json'):
+# not all data needs to be compared
+IGNORED_SECTIONS = ['number', 'alias', 'projectiles', 'version']
+
+
+def diff_keys(wowsinfo: dict, wowsinfo_bak: dict) -> tuple:
+    """
+    Get added and removed keys of each section, in the same order as wowsinfo and wowsinfo_bak
+    """
+    added = {}
+    removed = {}
+    for section in wowsinfo:
+        if section in IGNORED_SECTIONS or not isinstance(wowsinfo[section], dict):
+            continue
+        # keys in memory can still be numbers, like ship ids
+        new_keys = {str(key): key for key in wowsinfo[section]}
+        old_keys = wowsinfo_bak.get(section, {})
+
+        added_keys = new_keys.keys() - old_keys.keys()
+        if len(added_keys) > 0:
+            added[section] = [new_keys[key] for key in new_keys if key in added_keys]
+        removed_keys = old_keys.keys() - new_keys.keys()
+        if len(removed_keys) > 0:
+            removed[section] = [key for key in old_keys if key in removed_keys]
+    return added, removed
+
+
+def _ids_name(data: dict, key) -> str:
+    item = data[key]
+    if isinstance(item, dict) and isinstance(item.get('name'), str):
+        return item['name']
+    return None
+
+
+def _read_names(ids_names: set) -> dict:
+    """
+    Get English names from names.json, generate writes the English name of every item there
+    """
+    if not os.path.isfile('names.json'):
+        raise Exception('names.json not found, generate everything first')
+    names = json_codec.read('names.json')
+    return {key: names[key] for key in ids_names if key in names}
+
+
+def compare_new(public_test: bool, wowsinfo: dict = None) -> dict:
+    """
+    Write changes.log, changes_detail.log, patch.json and added.json. If wowsinfo is passed in, it is used instead of reading wowsinfo.json.
+    """
+    # make sure both wowsinfo.json and the backup exist
+    if wowsinfo is None and not os.path.isfile('wowsinfo.json'):
         raise Exception('wowsinfo.json not found')
 
     backup_file = 'wowsinfo.json.pt' if public_test else 'wowsinfo.json.live'
     if not os.path.isfile(backup_file):
         raise Exception(backup_file + ' not found')
 
-    # read wowsinfo.json and wowsinfo.json.bak
-    with open('wowsinfo.json', 'r', encoding='utf8') as info:
-        wowsinfo = json.load(info)
+    if wowsinfo is None:
+        with open('wowsinfo.json', 'r', encoding='utf8') as info:
+            wowsinfo = json_codec.load(info)
     with open(backup_file, 'r', encoding='utf8') as info_old:
-        wowsinfo_bak = json.load(info_old)
-    with open('lang.json', 'r', encoding='utf8') as lang:
-        english_lang = json.load(lang)['en']
+        wowsinfo_bak = json_codec.load(info_old)
+
+    added, removed = diff_keys(wowsinfo, wowsinfo_bak)
+    field_changes = diff(wowsinfo_bak, wowsinfo)
+    changed = changed_items(field_changes)
+    for section in IGNORED_SECTIONS:
+        changed.pop(section, None)
+
+    # only the names of changed items are needed
+    ids_names = set()
+    for section in added:
+        ids_names.update(_ids_name(wowsinfo[section], key) for key in added[section])
+    for section in removed:
+        ids_names.update(_ids_name(wowsinfo_bak[section], key) for key in removed[section])
+    for section in changed:
+        ids_names.update(_ids_name(wowsinfo_bak[section], key) for key in changed[section])
+    ids_names.discard(None)
+    english_lang = _read_names(ids_names) if len(ids_names) > 0 else {}
+
+    names = {}
+    for section in changed:
+        for key in changed[section]:
+            name = english_lang.get(_ids_name(wowsinfo_bak[section], key), key)
+            names[(section, key)] = name.encode('ascii', 'ignore').decode('ascii')
 
     with open('changes.log', 'w', encoding='utf8') as changes:
         has_changes = False
-        # compare wowsinfo.json and wowsinfo.json.bak
-        for item in wowsinfo:
-            # not all data needs to be compared
-            if item in ['number', 'alias', 'projectiles', 'version']:
-                continue
-            # check added items
-            for data in wowsinfo[item]:
-                if data not in wowsinfo_bak[item]:
-                    wowsinfo[item][data]['added'] = 1
-                    try:
-                        # get ids_name from data
-                        ids_name = wowsinfo[item][data]['name']
-                        name = english_lang[ids_name]
-                    except KeyError:
-                        name = data
-
-                    # fix unicode error, remove invalid characters
-                    name = name.encode('ascii', 'ignore').decode('ascii')
-                    # data may contain invalid
-                    print('- added', item, name, '({})'.format(data))
-                    changes.write('- added {} {} ({})\n'.format(item, name, data))
-                    has_changes = True
-                else:
-                    # remove the added key
-                    if 'added' in wowsinfo[item][data]:
-                        del wowsinfo[item][data]['added']
-            # also check removed
-            for data in wowsinfo_bak[item]:
-                if data not in wowsinfo[item]:
-                    try:
-                        # get ids_name from data
-                        ids_name = wowsinfo_bak[item][data]['name']
-                        name = english_lang[ids_name]
-                    except KeyError:
-                        name = data
-                    print('- removed', item, name, '({})'.format(data))
-                    changes.write('- removed {} {} ({})\n'.format(item, name, data))
-                    has_changes = True
-        
+        for section in wowsinfo:
+            for key in added.get(section, []):
+                name = english_lang.get(_ids_name(wowsinfo[section], key), str(key))
+                # fix unicode error, remove invalid characters
+                name = name.encode('ascii', 'ignore').decode('ascii')
+                print('- added', section, name, '({})'.format(key))
+                changes.write('- added {} {} ({})\n'.format(section, name, key))
+                has_changes = True
+            for key in removed.get(section, []):
+                name = english_lang.get(_ids_name(wowsinfo_bak[section], key), key)
+                print('- removed', section, name, '({})'.format(key))
+                changes.write('- removed {} {} ({})\n'.format(section, name, key))
+                has_changes = True
+            # every changed item would be too long for a commit message, changes_detail.log has them
+            if len(changed.get(section, {})) > 0:
+                print('-', len(changed[section]), section, 'changed')
+                changes.write('- {} {} changed, see changes.log\n'.format(len(changed[section]), section))
+                has_changes = True
+
         if not has_changes:
             print('No changes found')
             changes.write('No Changes')
 
-    # write wowsinfo.json
-    with open('wowsinfo.json', 'w', encoding='utf8') as info:
-        json.dump(wowsinfo, info, ensure_ascii=False)
+    with open('changes_detail.log', 'w', encoding='utf8') as f:
+        f.write(format_report(changed, names))
+    # the app can download this instead of the whole wowsinfo.json
+    with open('patch.json', 'w', encoding='utf8') as f:
+        f.write(json_codec.dumps(make_patch(wowsinfo_bak, wowsinfo, field_changes)))
+    print('{} fields changed'.format(len(field_changes)))
+
+    # section -> keys of new items, the app marks them as new
+    with open('added.json', 'w', encoding='utf8') as f:
+        f.write(json_codec.dumps({section: [str(key) for key in added[section]] for section in added}))
+    return wowsinfo
 
 if __name__ == '__main__':
     import sys
@@ -1,6 +1,15 @@
 import os, glob
 
-for file in glob.glob('*.json'):
-    if 'package' in file:
-        continue
-    os.remove(file)
\ No newline at end of file
+
+def clean():
+    """
+    Remove all generated json files from the last run
+    """
+    for file in glob.glob('*.json'):
+        if 'package' in file:
+            continue
+        os.remove(file)
+
+
+if __name__ == '__main__':
+    clean()
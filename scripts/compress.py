@@ -0,0 +1,165 @@
+"""
+Write compressed copies next to the files the app downloads so they don't have to be compressed on every request
+"""
+import gzip
+import hashlib
+import lzma
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import json_codec
+
+# only keep .xz if it is at least this much smaller than .gz
+XZ_MIN_SAVING = 0.05
+
+
+def _gzip(data: bytes) -> bytes:
+    # no time in the header so the same file always gives the same bytes
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _xz(data: bytes) -> bytes:
+    return lzma.compress(data, preset=9 | lzma.PRESET_EXTREME)
+
+
+def _write(filename: str, data: bytes):
+    temp_path = filename + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, filename)
+
+
+def _sha1(filename: str) -> str:
+    sha1 = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class Compressor:
+    """
+    Write .gz and .xz next to each file. A file is skipped if it hasn't changed since the last run
+    and what was written for it is still there. zlib and lzma release the GIL so threads are enough.
+    With cache_dir, compressed copies are kept there as well and copied next to files that haven't changed,
+    for files that are deleted and written again every run, like everything run.py moves to the data folder.
+    """
+
+    def __init__(self, state_file: str = 'compress.state', workers: int = None, cache_dir: str = None):
+        self._state_file = state_file
+        self._workers = workers or os.cpu_count() or 1
+        self._cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        # absolute filename -> {'sha1', 'gz', 'xz'}, sizes of what was written
+        self._state = {}
+        if os.path.exists(state_file):
+            self._state = json_codec.read(state_file)
+
+    def _kept(self, filename: str) -> str:
+        """
+        Where compressed copies of filename are kept without .gz or .xz, next to it without cache_dir
+        """
+        if self._cache_dir is None:
+            return filename
+        # files in different folders can have the same name
+        path_hash = hashlib.sha1(os.path.abspath(filename).encode('utf8')).hexdigest()[:12]
+        return os.path.join(self._cache_dir, '{}_{}'.format(path_hash, os.path.basename(filename)))
+
+    def _place(self, filename: str, xz: bool):
+        """
+        Copy what is kept in cache_dir next to filename
+        """
+        kept = self._kept(filename)
+        if kept == filename:
+            return
+        shutil.copyfile(kept + '.gz', filename + '.gz')
+        if xz:
+            shutil.copyfile(kept + '.xz', filename + '.xz')
+        elif os.path.exists(filename + '.xz'):
+            os.remove(filename + '.xz')
+
+    def _unchanged(self, filename: str, sha1: str) -> bool:
+        last = self._state.get(os.path.abspath(filename))
+        if last is None or last['sha1'] != sha1:
+            return False
+        kept = self._kept(filename)
+        if not os.path.exists(kept + '.gz'):
+            return False
+        return last['xz'] is None or os.path.exists(kept + '.xz')
+
+    def _compress(self, filename: str, sha1: str) -> dict:
+        with open(filename, 'rb') as f:
+            data = f.read()
+        gz_data = _gzip(data)
+        xz_data = _xz(data)
+        kept = self._kept(filename)
+        _write(kept + '.gz', gz_data)
+
+        xz_size = None
+        if len(xz_data) <= len(gz_data) * (1 - XZ_MIN_SAVING):
+            _write(kept + '.xz', xz_data)
+            xz_size = len(xz_data)
+        elif os.path.exists(kept + '.xz'):
+            # not worth it anymore
+            os.remove(kept + '.xz')
+        self._place(filename, xz_size is not None)
+        return {'sha1': sha1, 'gz': len(gz_data), 'xz': xz_size}
+
+    def compress(self, files: List[str]) -> List[dict]:
+        """
+        Compress files that exist and return the size of each one before and after
+        """
+        files = [f for f in files if os.path.exists(f)]
+        hashes = {}
+        with ThreadPoolExecutor(self._workers) as pool:
+            for filename, sha1 in zip(files, pool.map(_sha1, files)):
+                hashes[filename] = sha1
+
+            futures = {}
+            for filename in files:
+                if not self._unchanged(filename, hashes[filename]):
+                    futures[filename] = pool.submit(self._compress, filename, hashes[filename])
+
+            report = []
+            for filename in files:
+                skipped = filename not in futures
+                if not skipped:
+                    self._state[os.path.abspath(filename)] = futures[filename].result()
+                entry = self._state[os.path.abspath(filename)]
+                if skipped:
+                    self._place(filename, entry['xz'] is not None)
+                report.append({
+                    'file': filename,
+                    'size': os.path.getsize(filename),
+                    'gz': entry['gz'],
+                    'xz': entry['xz'],
+                    'skipped': skipped,
+                })
+
+        json_codec.write(self._state, self._state_file)
+        return report
+
+
+def format_report(report: List[dict]) -> List[str]:
+    lines = []
+    for entry in report:
+        size = entry['size']
+        line = '{}: {:.2f} MB, gz {:.2f} MB ({:.0%})'.format(
+            os.path.basename(entry['file']), size / 1024 / 1024, entry['gz'] / 1024 / 1024, entry['gz'] / max(size, 1))
+        if entry['xz'] is not None:
+            line += ', xz {:.2f} MB ({:.0%})'.format(entry['xz'] / 1024 / 1024, entry['xz'] / max(size, 1))
+        if entry['skipped']:
+            line += ', unchanged'
+        lines.append(line)
+    return lines
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 2:
+        raise Exception('Usage: %s <files...>' % sys.argv[0])
+    for line in format_report(Compressor().compress(sys.argv[1:])):
+        print(line)
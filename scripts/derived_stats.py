@@ -0,0 +1,162 @@
+"""
+Add stats that can be worked out from the components of a ship and its projectiles to every ship,
+like the damage per minute of the main battery, so the app doesn't have to walk components, guns, ammo
+and projectiles of every ship it shows.
+
+Every stat of every distinct component is a row of a component x stat matrix and every ship takes
+the best value of each component kind, so the stats are what the ship can have with the best modules.
+Air defense of the main battery, secondaries and dedicated guns adds up.
+"""
+import numpy as np
+
+# component kinds in the modules of a ship that stats are from
+KINDS = ['artillery', 'atba', 'torpedoes', 'airDefense']
+AMMO_TYPES = ['AP', 'HE', 'CS']
+AURAS = ['far', 'medium', 'near']
+# (field, sub field or None, digits), a stat is ship['derived'][field][sub field]
+STATS = [('mainDPM', ammo, 0) for ammo in AMMO_TYPES] + [
+    ('torpedoSalvo', None, 0),
+] + [('airDefenseDPS', aura, 1) for aura in AURAS] + [
+    ('secondaryDPM', None, 0),
+    ('secondaryRange', None, 2),
+]
+_COLUMNS = {(field, sub): i for i, (field, sub, _) in enumerate(STATS)}
+
+
+def _projectile_damage(projectiles: dict) -> dict:
+    """
+    Damage and ammo type of every projectile that does damage
+    """
+    damage = {}
+    for key, projectile in projectiles.items():
+        if projectile['type'] == 'Torpedo':
+            # this is the damage shown in the game
+            damage[key] = (projectile['alphaDamage'] / 3 + projectile['damage'], None)
+        elif projectile['type'] == 'Artillery':
+            damage[key] = (projectile['damage'], projectile['ammoType'])
+    return damage
+
+
+class _Components:
+    """
+    Flatten components into rows of (component, stat, value), a component shared by ships is only added once
+    """
+
+    def __init__(self, damage: dict):
+        self._damage = damage
+        # id of a component -> its row, components are the same object when they are shared
+        self.rows = {}
+        self.row = []
+        self.column = []
+        self.value = []
+        # stats that are set and not added up
+        self.fixed = []
+
+    def _add(self, row: int, field: str, sub: str, value: float):
+        self.row.append(row)
+        self.column.append(_COLUMNS[(field, sub)])
+        self.value.append(value)
+
+    def _guns(self, row: int, guns: list, field: str, by_ammo: bool):
+        for gun in guns:
+            # barrels times shots per minute
+            rate = gun['count'] * gun['each'] * 60 / gun['reload']
+            seen = set()
+            for ammo in gun['ammo']:
+                if not ammo in self._damage:
+                    continue
+                damage, ammo_type = self._damage[ammo]
+                sub = ammo_type if by_ammo else None
+                # only the first ammo of each type, a gun fires one of them at a time
+                if sub in seen or (by_ammo and not ammo_type in AMMO_TYPES):
+                    continue
+                seen.add(sub)
+                self._add(row, field, sub, rate * damage)
+
+    def add(self, kind: str, component: dict) -> int:
+        row = self.rows.get(id(component))
+        if row is not None:
+            return row
+        row = self.rows[id(component)] = len(self.rows)
+
+        if kind == 'artillery':
+            self._guns(row, component.get('guns', []), 'mainDPM', True)
+        elif kind == 'atba':
+            self._guns(row, component.get('guns', []), 'secondaryDPM', False)
+            self.fixed.append((row, _COLUMNS[('secondaryRange', None)], component['range'] / 1000))
+        elif kind == 'torpedoes':
+            # a salvo is every launcher firing once
+            for launcher in component.get('launchers', []):
+                best = max([self._damage[ammo][0] for ammo in launcher['ammo'] if ammo in self._damage] + [0])
+                self._add(row, 'torpedoSalvo', None, launcher['count'] * launcher['each'] * best)
+        for aura in AURAS:
+            for air_defense in component.get(aura, []):
+                self._add(row, 'airDefenseDPS', aura, air_defense['dps'])
+        return row
+
+    def matrix(self) -> np.ndarray:
+        matrix = np.zeros((len(self.rows), len(STATS)))
+        np.add.at(matrix, (np.array(self.row, dtype=int), np.array(self.column, dtype=int)),
+                  np.array(self.value, dtype=float))
+        for row, column, value in self.fixed:
+            matrix[row, column] = value
+        return matrix
+
+
+def derive(ships: dict, projectiles: dict) -> np.ndarray:
+    """
+    Get the ship x stat matrix, ships are in the same order as ships and stats in the same order as STATS
+    """
+    components = _Components(_projectile_damage(projectiles))
+    # ship, kind and component of every component of every ship
+    ship_index = []
+    kind_index = []
+    component_index = []
+    for i, ship in enumerate(ships.values()):
+        ship_components = ship['components']
+        kinds = {}
+        for modules in ship['modules'].values():
+            for module in modules:
+                for kind, names in module['components'].items():
+                    if kind in KINDS:
+                        for name in names:
+                            kinds[name] = kind
+        for name, kind in kinds.items():
+            # empty components are not in components
+            if not name in ship_components:
+                continue
+            ship_index.append(i)
+            kind_index.append(KINDS.index(kind))
+            component_index.append(components.add(kind, ship_components[name]))
+
+    # the best component of each kind, then kinds add up
+    by_kind = np.zeros((len(KINDS), len(ships), len(STATS)))
+    np.maximum.at(by_kind, (np.array(kind_index, dtype=int), np.array(ship_index, dtype=int)),
+                  components.matrix()[np.array(component_index, dtype=int)])
+    return by_kind.sum(axis=0)
+
+
+def add_derived_stats(ships: dict, projectiles: dict):
+    """
+    Add derived to every ship with any stat, stats that are 0 are left out
+    """
+    if len(ships) == 0:
+        return
+    matrix = derive(ships, projectiles)
+    for i, (_, _, digits) in enumerate(STATS):
+        matrix[:, i] = np.round(matrix[:, i], digits)
+
+    fields = [(field, sub, digits == 0) for field, sub, digits in STATS]
+    for ship, values in zip(ships.values(), matrix.tolist()):
+        derived = {}
+        for (field, sub, whole), value in zip(fields, values):
+            if value == 0:
+                continue
+            if whole:
+                value = int(value)
+            if sub is None:
+                derived[field] = value
+            else:
+                derived.setdefault(field, {})[sub] = value
+        if len(derived) > 0:
+            ship['derived'] = derived
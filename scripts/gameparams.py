@@ -0,0 +1,196 @@
+"""
+Read GameParams-0.json one top-level entry at a time instead of loading the whole file
+"""
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Iterator, List, Tuple
+
+import json_codec
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+def iter_json_object(filename: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, any, int, int]]:
+    """
+    Yield (key, value, offset, length) for every entry of the top-level object in filename.
+    offset and length are in bytes so the value can be read again with seek() later.
+    Only the current entry and a small read buffer are kept in memory.
+    """
+    # newline='' keeps \r\n as it is, otherwise the byte offsets would be wrong
+    with open(filename, 'r', encoding='utf8', newline='') as f:
+        buf = f.read(chunk_size)
+        eof = len(buf) == 0
+        # buf[mark] is at byte offset mark_bytes in the file
+        mark = 0
+        mark_bytes = 0
+
+        def refill(pos: int) -> bool:
+            nonlocal buf, eof
+            if eof:
+                return False
+            # read at least as much as we have not parsed yet so large entries don't get parsed too often
+            chunk = f.read(max(chunk_size, len(buf) - pos))
+            if len(chunk) == 0:
+                eof = True
+                return False
+            buf += chunk
+            return True
+
+        def skip(pos: int) -> int:
+            while True:
+                pos = _WHITESPACE.match(buf, pos).end()
+                if pos < len(buf) or not refill(pos):
+                    return pos
+
+        def decode(pos: int):
+            while True:
+                try:
+                    value, end = _decoder.raw_decode(buf, pos)
+                    # a number can be cut in half at the end of the buffer
+                    if end < len(buf) or eof:
+                        return value, end
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                if not refill(pos):
+                    return _decoder.raw_decode(buf, pos)
+
+        def byte_offset(pos: int) -> int:
+            nonlocal mark, mark_bytes
+            mark_bytes += len(buf[mark:pos].encode('utf8'))
+            mark = pos
+            return mark_bytes
+
+        pos = skip(0)
+        if pos >= len(buf) or buf[pos] != '{':
+            raise ValueError('{} is not a JSON object'.format(filename))
+        pos += 1
+        while True:
+            pos = skip(pos)
+            if pos >= len(buf):
+                raise ValueError('{} ended unexpectedly'.format(filename))
+            if buf[pos] == '}':
+                return
+            if buf[pos] == ',':
+                pos += 1
+                continue
+
+            key, pos = decode(pos)
+            pos = skip(pos)
+            if buf[pos] != ':':
+                raise ValueError('Expected : after {} in {}'.format(key, filename))
+            pos = skip(pos + 1)
+            value, end = decode(pos)
+            offset = byte_offset(pos)
+            length = byte_offset(end) - offset
+            yield key, value, offset, length
+            pos = end
+
+            # drop what we have parsed so the buffer stays small
+            if pos > chunk_size:
+                byte_offset(pos)
+                buf = buf[pos:]
+                pos = 0
+                mark = 0
+
+
+class ParamsIndex:
+    """
+    Map typeinfo.type and typeinfo.species to the keys of game params, in file order
+    """
+
+    def __init__(self):
+        self.types = {}
+        self.species = {}
+        self._position = {}
+
+    def add(self, key: str, item: dict):
+        typeinfo = item['typeinfo']
+        self._position[key] = len(self._position)
+        self.types.setdefault(typeinfo['type'], []).append(key)
+        self.species.setdefault(typeinfo['species'], []).append(key)
+
+    def select(self, types: List[str] = (), species: List[str] = ()) -> List[str]:
+        """
+        Get all keys matching any of the types or species, in file order
+        """
+        keys = set()
+        for t in types:
+            keys.update(self.types.get(t, []))
+        for s in species:
+            keys.update(self.species.get(s, []))
+        return sorted(keys, key=self._position.__getitem__)
+
+
+class StreamingGameParams:
+    """
+    A read-only dict-like view of GameParams-0.json. Only an offset index is kept in memory,
+    items() streams the file again and lookups by key read a single entry from disk.
+    """
+
+    def __init__(self, filename: str, cache_size: int = 256):
+        self._filename = filename
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._file = None
+        self._pid = None
+        # key -> (offset, length) in bytes
+        self._index = {}
+        self.index = ParamsIndex()
+        for key, item, offset, length in iter_json_object(filename):
+            self._index[key] = (offset, length)
+            self.index.add(key, item)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """
+        Stream all entries in file order
+        """
+        for key, item, _, _ in iter_json_object(self._filename):
+            yield key, item
+
+    def get(self, key: str, default=None):
+        if key not in self._index:
+            return default
+        return self[key]
+
+    def __getitem__(self, key: str) -> dict:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        offset, length = self._index[key]
+        f = self._open()
+        f.seek(offset)
+        item = json_codec.loads(f.read(length))
+
+        self._cache[key] = item
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return item
+
+    def _open(self):
+        # file handles can't be shared with forked processes
+        if self._file is None or self._pid != os.getpid():
+            self._file = open(self._filename, 'rb')
+            self._pid = os.getpid()
+        return self._file
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -2,37 +2,128 @@
 """
 import required modules and helper methods
 """
-import glob
-import json
+import hashlib
+import math
+import multiprocessing
 import os
 import re
-from typing import List, Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import List
 from additional import merge_additional
+from ballistics import Ballistics
+from derived_stats import add_derived_stats
+from gameparams import ParamsIndex, StreamingGameParams
+from incremental import IncrementalState, TrackedParams
+import json_codec
+from lang_builder import build_lang
+from lang_registry import LangKeyRegistry
+from memory import MemoryTracker
+from prefix_matcher import PrefixMatcher
+from profiler import Profiler
+from params_cache import ParamsCache
+from section_writer import SectionWriter
+from shards import write_shards
+from string_table import write_string_table
+from wowsinfo_bin import write_bin
 
 
 class WoWsGenerate:
 
+    # game params from read(), released once everything is unpacked
+    _params: dict = None
     # store all language keys we use
-    _lang_keys: List[str] = []
-    _modifiers: dict = {}
+    _lang_keys: LangKeyRegistry = None
+    _modifiers: dict = None
     # store all regions, ship types and all other data we need
-    _game_info: dict = {}
+    _game_info: dict = None
+
+    # all sections we generate and their outputs, generate.py --sections can pick some of them
+    _SECTION_OUTPUTS = {
+        'ships': ['ships', 'ship_index', 'alias'],
+        'achievements': ['achievements'],
+        'exteriors': ['exteriors'],
+        'modernizations': ['modernizations'],
+        'skills': ['commander_skills'],
+        'projectiles': ['projectiles'],
+        'aircrafts': ['aircrafts'],
+        'abilities': ['abilities'],
+        'camoboost': ['camoboost'],
+        'dog_tag': ['dog_tag'],
+    }
+    # game params each section needs by typeinfo.type or typeinfo.species
+    _SECTION_TYPES = {
+        'ships': ['Ship'],
+        'achievements': ['Achievement'],
+        'exteriors': ['Exterior'],
+        'modernizations': ['Modernization'],
+        'skills': ['Crew'],
+        'projectiles': ['Projectile'],
+        'aircrafts': ['Aircraft'],
+        'abilities': ['Ability'],
+        'dog_tag': ['DogTag'],
+    }
+    _SECTION_SPECIES = {
+        'camoboost': ['Camoboost'],
+    }
+    # the section of each type, language keys remember which section needs them
+    _TYPE_SECTIONS = {t: section for section, types in _SECTION_TYPES.items() for t in types}
+    _SPECIES_SECTIONS = {s: section for section, species in _SECTION_SPECIES.items() for s in species}
+    # these go through game params and call the handlers, they are not handlers themselves
+    _UNPACK_DRIVERS = ['_unpack_item', '_unpack_parallel', '_unpack_isolated', '_unpack_incremental']
 
     def __init__(self):
-        self._game_info['regions'] = {}
-        self._game_info['types'] = {}
-
-    def read(self):
+        self._lang_keys = LangKeyRegistry()
+        self._lang_rules = self._read_lang_rules()
+        # language keys we need from the English table, like all modifiers
+        self._lang_matcher = PrefixMatcher(
+            [values[0] for values in self._lang_rules.get('prefix', [])],
+            [values[0] for values in self._lang_rules.get('suffix', [])]
+        )
+        self._modifiers = {}
+        self._game_info = {'regions': {}, 'types': {}}
+        # every json file is written by it, wowsinfo.json reuses what is written
+        self.writer = SectionWriter()
+        self._profiler = None
+        self._memory = None
+        # (component type, hash of the component) -> unpacked component and the language keys it added
+        self._component_memo = {}
+        self._component_hits = 0
+        self._component_misses = 0
+        # range tables of shells, see ballistics.py
+        self.ballistics = Ballistics()
+
+    def read(self, stream: bool = False, cache: bool = True, install: str = 'live'):
         """
-        Read game params and language files
+        Read game params and language files. With stream, only an offset index of
+        game params is kept in memory and entries are parsed when they are needed.
+        Otherwise, parsed game params are cached per install (live / pt) unless cache is False.
         """
-        print('Reading game params...')
-        self._params = self._read_gameparams()
-        print('Loaded game params!')
-        self._params_keys = list(self._params.keys())
-        self._lang = self._read_lang('en')
-        # get all Japanese ship names
-        self._lang_sg = self._read_lang('zh_sg')
+        # workers need to read the same way when they can't be forked
+        self._read_options = {'stream': stream, 'cache': cache, 'install': install}
+        with self._stage('read'):
+            print('Reading game params...')
+            if stream:
+                self._params = StreamingGameParams('GameParams-0.json')
+                print('Indexed {} game params!'.format(len(self._params)))
+            elif cache:
+                params_cache = ParamsCache('GameParams-0.json', install)
+                self._params = params_cache.load(self._read_gameparams)
+                print('Loaded game params!')
+            else:
+                self._params = self._read_gameparams()
+                print('Loaded game params!')
+            self._params_keys = list(self._params.keys())
+            # map types and species to keys so we can only go through what we need
+            if stream:
+                self._index = self._params.index
+            else:
+                self._index = ParamsIndex()
+                for key, item in self._params.items():
+                    self._index.add(key, item)
+            self._lang = self._read_lang('en')
+            # get all Japanese ship names
+            self._lang_sg = self._read_lang('zh_sg')
         return self
 
     """
@@ -43,11 +134,11 @@ class WoWsGenerate:
     def _read_lang(self, language: str) -> dict:
         return self._read_json('langs/{}_lang.json'.format(language))
 
-    def _read_supported_langs(self) -> dict:
+    def _supported_lang_files(self) -> dict:
         """
-        Read all language files and return a dict
+        Get the language file of all supported languages
         """
-        lang_dict = {}
+        lang_files = {}
         for lang in self._list_dir('langs'):
             if '.git' in lang:
                 continue
@@ -55,28 +146,84 @@ class WoWsGenerate:
             lang = lang.replace('_lang.json', '')
             if not lang in ['en', 'ja', 'zh_sg', 'zh_tw']:
                 continue
-            print('Reading language {}...'.format(lang))
-            lang_dict[lang] = self._read_lang(lang)
-        return lang_dict
+            lang_files[lang] = 'langs/{}_lang.json'.format(lang)
+        return lang_files
 
-    def _read_json(self, filename: str) -> dict:
+    def _read_lang_rules(self) -> dict:
+        """
+        Read lang_keys.rules next to this script, each line is a rule name followed by its values
+        """
+        rules = {}
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lang_keys.rules')
         with open(filename, 'r', encoding='utf8') as f:
-            json_dict = json.load(f)
-        return json_dict
+            for line in f:
+                line = line.strip()
+                if line == '' or line.startswith('#'):
+                    continue
+                rule, *values = line.split()
+                rules.setdefault(rule, []).append(values)
+        return rules
+
+    def _read_json(self, filename: str) -> dict:
+        return json_codec.read(filename)
 
     def _read_gameparams(self) -> dict:
         return self._read_json('GameParams-0.json')
 
-    def _write_json(self, data: dict, filename: str):
-        with open(filename, 'w', encoding='utf8') as f:
-            json_str = json.dumps(data, ensure_ascii=False)
-            f.write(json_str)
+    def _read_game_info(self, game_path: str) -> tuple:
+        """
+        Get the installed game version and whether it is public test from game_info.xml
+        """
+        game_info_path = os.path.join(game_path, "game_info.xml")
+        with open(game_info_path, 'r') as f:
+            game_info = f.read()
+            game_version = game_info.split('installed="')[1].split('"')[0]
+            public_test = '<id>WOWS.PT.PRODUCTION</id>' in game_info
+        return game_version, public_test
+
+    def _write_json(self, data: dict, filename: str, section: str = None):
+        """
+        Write data to filename, with section wowsinfo.json can reuse what is written for its section
+        """
+        with self._stage('write'):
+            self.writer.write(data, filename, section)
+
+    def enable_profile(self, profiler: Profiler = None) -> Profiler:
+        """
+        Time stages, every _unpack_* handler and every type of game params entry
+        """
+        self._profiler = profiler or Profiler()
+        handlers = [name for name in dir(WoWsGenerate) if name.startswith('_unpack_') and not name in self._UNPACK_DRIVERS]
+        self._profiler.wrap(self, handlers, '_unpack_item')
+        return self._profiler
 
-    def _sizeof_json(self, filename: str) -> float:
+    def enable_memory(self, tracker: MemoryTracker = None) -> MemoryTracker:
+        """
+        Measure memory of every stage and of unpacking each section, like unpack.ships.
+        Sections are only measured when they are unpacked in this process.
         """
-        Get the size of a json file
+        self._memory = tracker or MemoryTracker()
+        self._memory.wrap(self, '_unpack_item', self._memory_stage)
+        return self._memory
+
+    def _memory_stage(self, key: str, item: dict, data: dict) -> str:
+        typeinfo = item['typeinfo']
+        section = self._SPECIES_SECTIONS.get(typeinfo['species'], self._TYPE_SECTIONS.get(typeinfo['type']))
+        if section is None or not section in self._SECTION_OUTPUTS:
+            return None
+        return 'unpack.' + section
+
+    def _stage(self, name: str):
         """
-        return os.path.getsize(filename) / 1024 / 1024
+        Time a stage like read or write when profiling and measure its memory when tracking memory,
+        stages can be entered more than once
+        """
+        stage = ExitStack()
+        if self._profiler is not None:
+            stage.enter_context(self._profiler.stage(name))
+        if self._memory is not None:
+            stage.enter_context(self._memory.stage(name))
+        return stage
 
     def _list_dir(self, dir: str) -> list:
         """
@@ -88,15 +235,6 @@ class WoWsGenerate:
         # TODO: in the future, we may need to keep more digits in case our calculation in app is not accurate
         return round(num, digits)
 
-    def _match(self, text: str, patterns: List[str], method: Callable[[str, str], bool]) -> bool:
-        """
-        Match text with patterns
-        """
-        for pattern in patterns:
-            if method(text, pattern):
-                return True
-        return False
-
     def _tree(self, data: any, depth: int = 2, tab: int = 0, show_value: bool = False):
         """
         Show the structure tree of a dict. This is useful when analysing the data.
@@ -120,28 +258,27 @@ class WoWsGenerate:
             print('\t' * tab + '- ' + level)
             self._tree(data[level], depth - 1, tab + 1, show_value=show_value)
 
-    def _merge(self, weapons: dict) -> dict:
-        # join same weapons together into one dict
-        merged = []
-        counter = []
+    def _fingerprint(self, value: any):
+        """
+        Get a hashable fingerprint of dicts and lists, equal values always have the same fingerprint
+        """
+        if isinstance(value, dict):
+            return ('dict', tuple(sorted((k, self._fingerprint(v)) for k, v in value.items())))
+        if isinstance(value, list):
+            return ('list', tuple(self._fingerprint(v) for v in value))
+        return value
+
+    def _merge(self, weapons: list) -> list:
+        # join same weapons together into one dict, keep the order they are first seen
+        merged = {}
         for w in weapons:
-            if len(merged) == 0:
-                merged.append(w)
-                counter.append(1)
-                continue
-
-            found = False
-            for m in merged:
-                if w == m:
-                    counter[merged.index(m)] += 1
-                    found = True
-                    break
-            if not found:
-                merged.append(w)
-                counter.append(1)
-        for m in merged:
-            m['count'] = counter[merged.index(m)]
-        return merged
+            fingerprint = self._fingerprint(w)
+            if fingerprint in merged:
+                merged[fingerprint]['count'] += 1
+            else:
+                w['count'] = 1
+                merged[fingerprint] = w
+        return list(merged.values())
 
     def _IDS(self, key: str) -> str:
         return 'IDS_' + key.upper()
@@ -208,7 +345,7 @@ class WoWsGenerate:
                 gun_dict['reload'] = float(gun['shotDelay'])
                 # don't forget about the lang key
                 gun_dict['name'] = self._IDS(gun['name'])
-                self._lang_keys.append(gun_dict['name'])
+                self._lang_keys.add(gun_dict['name'])
                 aa_guns_info.append(gun_dict)
 
             air_defense_info = {}
@@ -377,7 +514,7 @@ class WoWsGenerate:
                 air_support['plane'] = plane_name
                 plane_name_title = self._IDS(plane_name)
                 air_support['name'] = plane_name_title
-                self._lang_keys.append(plane_name_title)
+                self._lang_keys.add(plane_name_title)
 
             air_support['reload'] = module['reloadTime']
             air_support['range'] = self._roundUp(
@@ -498,6 +635,72 @@ class WoWsGenerate:
     #endregion
 
     #region Ship Params
+    def _module_indices(self, ship_upgrade_info: dict) -> dict:
+        """
+        Get how many modules come before each module in its line by following prev.
+        Every module is only visited once, modules before it are remembered.
+        """
+        indices = {}
+        for module_key in ship_upgrade_info:
+            if not isinstance(ship_upgrade_info[module_key], dict) or module_key in indices:
+                continue
+
+            # go back until the first module or a module we have seen
+            chain = []
+            visited = set()
+            current = module_key
+            while current != '' and not current in indices:
+                if current in visited:
+                    raise Exception('{} is in a loop of modules: {}'.format(current, ' -> '.join(chain)))
+                chain.append(current)
+                visited.add(current)
+                current = ship_upgrade_info[current]['prev']
+
+            index = indices[current] if current != '' else -1
+            for key in reversed(chain):
+                index += 1
+                indices[key] = index
+        return indices
+
+    def _module_graph(self, ship_upgrade_info: dict, indices: dict, positions: dict) -> dict:
+        """
+        Get the order and edges of modules of each type, modules are where they are in modules[type].
+        Order goes from the first module to the last one, each edge is [prev, next].
+        """
+        graph = {}
+        for module_key, (module_type, position) in positions.items():
+            if not module_type in graph:
+                graph[module_type] = {'order': [], 'edges': []}
+            graph[module_type]['order'].append((indices[module_key], position))
+
+            prev = ship_upgrade_info[module_key]['prev']
+            # modules only follow modules of the same type
+            if prev != '' and positions[prev][0] == module_type:
+                graph[module_type]['edges'].append([positions[prev][1], position])
+
+        for modules in graph.values():
+            modules['order'] = [position for _, position in sorted(modules['order'])]
+            modules['edges'].sort()
+        return graph
+
+    def _ship_components(self, component_name: str, component_type: str, ship: dict, params: dict) -> dict:
+        """
+        The same as _unpack_ship_components but every component is only unpacked once, ships share a lot of them.
+        The language keys a component added are added again when it is reused.
+        """
+        # unlike _fingerprint, the order of keys and 1 / 1.0 matter because components can be written as they are
+        memo_key = (component_type, hashlib.sha1(json_codec.fast_dumps(ship[component_name])).digest())
+        memo = self._component_memo.get(memo_key)
+        if memo is None:
+            with self._lang_keys.record() as lang_keys:
+                component = self._unpack_ship_components(component_name, component_type, ship, params)
+            memo = self._component_memo[memo_key] = (component[component_name], lang_keys)
+            self._component_misses += 1
+        else:
+            self._lang_keys.update(memo[1])
+            self._component_hits += 1
+        return {component_name: memo[0]}
+
     def _unpack_ship_params(self, item: dict, params: dict) -> dict:
         # get the structure overall
         # self._tree(item, depth=2, show_value=True)
@@ -508,9 +711,9 @@ class WoWsGenerate:
         ship_params['name'] = lang_key
         ship_params['description'] = lang_key + '_DESCR'
         ship_params['year'] = lang_key + '_YEAR'
-        self._lang_keys.append(lang_key)
-        self._lang_keys.append(lang_key + '_DESCR')
-        self._lang_keys.append(lang_key + '_YEAR')
+        self._lang_keys.add(lang_key)
+        self._lang_keys.add(lang_key + '_DESCR')
+        self._lang_keys.add(lang_key + '_YEAR')
 
         ship_params['paperShip'] = item['isPaperShip']
         ship_params['id'] = ship_id
@@ -528,8 +731,8 @@ class WoWsGenerate:
         species_lang = self._IDS(species.upper())
         ship_params['regionID'] = nation_lang
         ship_params['typeID'] = species_lang
-        self._lang_keys.append(nation_lang)
-        self._lang_keys.append(species_lang)
+        self._lang_keys.add(nation_lang)
+        self._lang_keys.add(species_lang)
 
         if (len(item['permoflages']) > 0):
             ship_params['permoflages'] = item['permoflages']
@@ -553,6 +756,9 @@ class WoWsGenerate:
         # module and component are separated so we can take whichever we need from the app
         module_tree = {}
         component_tree = {}
+        # where each module is in module_tree
+        module_positions = {}
+        module_indices = self._module_indices(ship_upgrade_info)
         for module_key in ship_upgrade_info:
             current_module = ship_upgrade_info[module_key]
             if not isinstance(current_module, dict):
@@ -572,14 +778,8 @@ class WoWsGenerate:
 
             module_type = current_module['ucType']
 
-            # TODO: the dictionary seems to be sorted so this might not be necessary but just in case, we do this for now
-            # find the index of the current module
-            module_index = 0
-            prev = current_module['prev']
-            while prev != '':
-                prev = ship_upgrade_info[prev]['prev']
-                module_index += 1
-            module_info['index'] = module_index
+            # the dictionary seems to be sorted but the index comes from prev just in case
+            module_info['index'] = module_indices[module_key]
 
             # NOTE: all modules can have information about next ship, don't only check HULL
             if 'nextShips' in current_module:
@@ -608,7 +808,7 @@ class WoWsGenerate:
                     # there can be duplicates
                     if component_name in component_tree:
                         continue
-                    component = self._unpack_ship_components(
+                    component = self._ship_components(
                         component_name, component_key, item, params
                     )
 
@@ -621,13 +821,16 @@ class WoWsGenerate:
             # there can be multiple modules of the same type
             moduleName = self._IDS(module_key)
             module_info['name'] = moduleName
-            self._lang_keys.append(moduleName)
+            self._lang_keys.add(moduleName)
             if module_type in module_tree:
                 module_tree[module_type].append(module_info)
             else:
                 module_tree[module_type] = [module_info]
+            module_positions[module_key] = (module_type, len(module_tree[module_type]) - 1)
         ship_params['modules'] = module_tree
         ship_params['components'] = component_tree
+        # the app can draw module trees from this
+        ship_params['moduleGraph'] = self._module_graph(ship_upgrade_info, module_indices, module_positions)
 
         if len(air_defense) > 0:
             ship_params['airDefense'] = air_defense
@@ -646,8 +849,8 @@ class WoWsGenerate:
         achievements['icon'] = name
         achievements['name'] = lang_name
         achievements['description'] = description
-        self._lang_keys.append(lang_name)
-        self._lang_keys.append(description)
+        self._lang_keys.add(lang_name)
+        self._lang_keys.add(description)
 
         achievements['type'] = item['battleTypes']
         achievements['id'] = item['id']
@@ -670,7 +873,7 @@ class WoWsGenerate:
         exterior['id'] = item['id']
         name = self._IDS(key)
         exterior['name'] = name
-        self._lang_keys.append(name)
+        self._lang_keys.add(name)
         exterior['icon'] = key
 
         costCR = item['costCR']
@@ -690,7 +893,7 @@ class WoWsGenerate:
             # add the description
             description = name + '_DESCRIPTION'
             exterior['description'] = description
-            self._lang_keys.append(description)
+            self._lang_keys.add(description)
 
         # exterior['name'] = item['name']
         # exterior['name'] = item['name']
@@ -712,8 +915,8 @@ class WoWsGenerate:
         name = item['name']
         lang_name = 'IDS_TITLE_' + name.upper()
         description = 'IDS_DESC_' + name.upper()
-        self._lang_keys.append(lang_name)
-        self._lang_keys.append(description)
+        self._lang_keys.add(lang_name)
+        self._lang_keys.add(description)
 
         modernization = {}
         modernization['slot'] = slot
@@ -846,6 +1049,16 @@ class WoWsGenerate:
             projectile['fuseTime'] = item['bulletDetonator']
         return projectile
 
+    def _add_ballistics(self, projectiles: dict):
+        """
+        Add range tables to every artillery shell, they are flown all together so it is done after unpacking
+        """
+        keys = [key for key in projectiles if projectiles[key]['type'] == 'Artillery']
+        tables = self.ballistics.tables([self._params[key] for key in keys])
+        for key, table in zip(keys, tables):
+            if table is not None:
+                projectiles[key]['ballistics'] = table
+
     def _unpack_projectiles(self, item: dict, key: str) -> dict:
         """
         Unpack all projectiles, like shells, torpedoes, and more. This is launched, fired or emitted? from a weapon.
@@ -857,7 +1070,7 @@ class WoWsGenerate:
         projectile['nation'] = projectile_nation
 
         name = self._IDS(key)
-        self._lang_keys.append(name)
+        self._lang_keys.add(name)
         projectile['name'] = name
 
         if projectile_type == 'Torpedo':
@@ -925,7 +1138,7 @@ class WoWsGenerate:
         aircraft['type'] = aircraft_type
         aircraft['nation'] = item['typeinfo']['nation']
         name = self._IDS(key)
-        self._lang_keys.append(name)
+        self._lang_keys.add(name)
         aircraft['name'] = name
 
         if aircraft_type in ['Fighter', 'Bomber', 'Skip', 'Scout', 'Dive', 'Smoke']:
@@ -996,8 +1209,8 @@ class WoWsGenerate:
         abilities['icon'] = key
         # prepare for any potential alternative name & description
         abilities['alter'] = {}
-        self._lang_keys.append(name)
-        self._lang_keys.append(description)
+        self._lang_keys.add(name)
+        self._lang_keys.add(description)
 
         ability_dict = {}
         for item_key in item:
@@ -1031,8 +1244,8 @@ class WoWsGenerate:
                         'name': icon_name,
                         'description': icon_description
                     }
-                    self._lang_keys.append(icon_name)
-                    self._lang_keys.append(icon_description)
+                    self._lang_keys.add(icon_name)
+                    self._lang_keys.add(icon_description)
 
                 # save all the modifiers
                 self._modifiers[ability_key] = value
@@ -1044,7 +1257,7 @@ class WoWsGenerate:
                         abilities['filter'] = ability_type
                         type_lang = 'IDS_BATTLEHINT_TYPE_CONSUMABLE_' + ability_type
                         abilities['type'] = type_lang
-                        self._lang_keys.append(type_lang)
+                        self._lang_keys.add(type_lang)
                     continue
 
                 if ability_key == 'fightersName':
@@ -1136,124 +1349,355 @@ class WoWsGenerate:
     # %%
 
     #region Core Generation
-    def generate(self, game_path: str):
-        if self._params is None:
-            raise Exception('Call read() first')
+    def _unpack_item(self, key: str, item: dict, data: dict):
+        """
+        Unpack one game params entry into the section dicts in data, sections not in data are skipped
+        """
+        typeinfo = item['typeinfo']
+        item_type = typeinfo['type']
+        item_species = typeinfo['species']
+        self._lang_keys.use(self._TYPE_SECTIONS.get(item_type, item_type), key)
+
+        # key_name = 'PJSB018'
+        # if not key_name in key:
+        #     return
+        # if key_name in key:
+        #     self._write_json(item, '{}.json'.format(key_name))
+        #     # print(self._unpack_ship_params(item, params))
+        #     exit(1)
+
+        if item_species == 'Camoboost' and 'camoboost' in data:
+            data['camoboost'][item['id']] = item
+
+        if item_type == 'DogTag' and 'dog_tag' in data:
+            dog_tag_index = item['index']
+            dog_tag_id = item['id']
+            data['dog_tag'][dog_tag_id] = {
+                'index': dog_tag_index,
+            }
+
+        if item_type == 'Ship' and 'ships' in data:
+            data['ships'].update(self._unpack_ship_params(item, self._params))
+            data['ship_index'][item['id']] = {
+                'index': item['index'],
+                'tier': item['level']
+            }
+
+            # get Japanese ship names
+            if typeinfo['nation'] == 'Japan':
+                data['alias'].update(self._unpack_japanese_alias(
+                    item, self._lang_sg))
+        elif item_type == 'Achievement' and 'achievements' in data:
+            data['achievements'].update(self._unpack_achievements(item, key))
+        elif item_type == 'Exterior' and 'exteriors' in data:
+            data['exteriors'].update(self._unpack_exteriors(item, key))
+        elif item_type == 'Modernization' and 'modernizations' in data:
+            modernization = self._unpack_modernization(item, self._params)
+            if modernization != None:
+                data['modernizations'].update(modernization)
+        elif item_type == 'Crew' and 'commander_skills' in data:
+            if key == 'PAW001_DefaultCrew':
+                # save the shared one
+                data['commander_skills'][key] = item
+                return
+
+            # TODO: move to unpack_crews
+            if item['CrewPersonality']['isUnique'] == True:
+                data['commander_skills'][key] = item
+
+            for s in item['Skills']:
+                modifiers = item['Skills'][s]['modifiers']
+                for m in modifiers:
+                    self._modifiers[m] = modifiers[m]
+        elif item_type == 'Gun':
+            # weapons.update(self._unpack_weapons(item, key))
+            return
+        elif item_type == 'Projectile' and 'projectiles' in data:
+            data['projectiles'].update(self._unpack_projectiles(item, key))
+        elif item_type == 'Aircraft' and 'aircrafts' in data:
+            data['aircrafts'].update(self._unpack_aircrafts(item, key))
+        elif item_type == 'Ability' and 'abilities' in data:
+            data['abilities'].update(self._unpack_abilities(item, key))
+
+    def _section_keys(self, sections: List[str]) -> List[str]:
+        """
+        Get keys of all game params needed by sections, in file order
+        """
+        types = []
+        species = []
+        for section in sections:
+            types += self._SECTION_TYPES.get(section, [])
+            species += self._SECTION_SPECIES.get(section, [])
+        return self._index.select(types, species)
+
+    def _new_sections(self, sections: List[str]) -> dict:
+        """
+        Each section can have multiple outputs, like ships.json, ship_index.json and alias.json
+        """
+        data = {}
+        for section in sections:
+            for output in self._SECTION_OUTPUTS[section]:
+                data[output] = {}
+        return data
 
-        # TODO: make this a function when everything is done
-        ships = {}
-        achievements = {}
-        exteriors = {}
-        modernizations = {}
-        skills = {}
-        weapons = {}
-        projectiles = {}
-        aircrafts = {}
-        abilitites = {}
-        alias = {}
-        ship_index = {}
-        camoboost = {}
-        dog_tag = {}
-        for key in self._params_keys:
-            item = self._params[key]
-            item_type = item['typeinfo']['type']
-            item_nation = item['typeinfo']['nation']
-            item_species = item['typeinfo']['species']
-
-            # key_name = 'PJSB018'
-            # if not key_name in key:
-            #     continue
-            # if key_name in key:
-            #     self._write_json(item, '{}.json'.format(key_name))
-            #     # print(self._unpack_ship_params(item, params))
-            #     exit(1)
-
-            if item_species == 'Camoboost':
-                camoboost[item['id']] = item
-
-            if item_type == 'DogTag':
-                dog_tag_index = item['index']
-                dog_tag_id = item['id']
-                dog_tag[dog_tag_id] = {
-                    'index': dog_tag_index,
-                }
-
-            if item_type == 'Ship':
-                ships.update(self._unpack_ship_params(item, self._params))
-                ship_index[item['id']] = {
-                    'index': item['index'],
-                    'tier': item['level']
-                }
-
-                # get Japanese ship names
-                if item['typeinfo']['nation'] == 'Japan':
-                    alias.update(self._unpack_japanese_alias(
-                        item, self._lang_sg))
-            elif item_type == 'Achievement':
-                achievements.update(self._unpack_achievements(item, key))
-            elif item_type == 'Exterior':
-                exteriors.update(self._unpack_exteriors(item, key))
-            elif item_type == 'Modernization':
-                modernization = self._unpack_modernization(item, self._params)
-                if modernization != None:
-                    modernizations.update(modernization)
-            elif item_type == 'Crew':
-                if key == 'PAW001_DefaultCrew':
-                    # save the shared one
-                    skills[key] = item
+    def _map_shards(self, function, shards: list, workers: int):
+        """
+        Run function (a worker function below) on every shard with a process pool and yield what it returns in order.
+        Profiles and memo stats of the workers are merged here.
+        """
+        global _worker_generator
+        # forked workers share what we have read already, spawned workers have to read everything again
+        start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(start_method)
+        _worker_generator = self
+        try:
+            initargs = (self._read_options, self._profiler is not None)
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=initargs) as pool:
+                for result, profile, memo_stats in pool.map(function, shards):
+                    if profile is not None:
+                        self._profiler.merge(profile)
+                    # every worker has its own memo of ship components
+                    self._component_hits += memo_stats[0]
+                    self._component_misses += memo_stats[1]
+                    yield result
+        finally:
+            _worker_generator = None
+
+    def _shard(self, keys: List[str], sections: List[str], workers: int) -> list:
+        # more shards than workers so a shard full of ships doesn't hold everything up
+        shard_size = max(1, math.ceil(len(keys) / (workers * 4)))
+        return [(keys[i:i + shard_size], sections) for i in range(0, len(keys), shard_size)]
+
+    def _unpack_parallel(self, keys: List[str], sections: List[str], workers: int) -> dict:
+        """
+        Unpack keys in shards with a process pool. Shards are merged in order so
+        the output is exactly the same as unpacking everything one by one.
+        """
+        shards = self._shard(keys, sections, workers)
+        print('Unpacking {} shards with {} workers...'.format(len(shards), workers))
+        data = self._new_sections(sections)
+        for shard_data, lang_keys, modifiers, game_info in self._map_shards(_unpack_shard, shards, workers):
+            for output in shard_data:
+                data[output].update(shard_data[output])
+            self._lang_keys.merge(lang_keys)
+            self._modifiers.update(modifiers)
+            self._game_info['regions'].update(game_info['regions'])
+            self._game_info['types'].update(game_info['types'])
+        return data
+
+    def _unpack_isolated(self, key: str, item: dict, sections: List[str]) -> tuple:
+        """
+        Unpack one entry with empty collectors. Returns what it generated and which other entries it looked up.
+        """
+        collectors = (self._params, self._lang_keys, self._modifiers, self._game_info)
+        tracked = TrackedParams(self._params)
+        self._params = tracked
+        self._lang_keys = LangKeyRegistry()
+        self._modifiers = {}
+        self._game_info = {'regions': {}, 'types': {}}
+        data = self._new_sections(sections)
+        try:
+            self._unpack_item(key, item, data)
+            entry = {
+                'data': {output: data[output] for output in data if len(data[output]) > 0},
+                'lang_keys': self._lang_keys,
+                'modifiers': self._modifiers,
+                'game_info': self._game_info,
+            }
+        finally:
+            self._params, self._lang_keys, self._modifiers, self._game_info = collectors
+        return entry, tracked.used
+
+    def _incremental_version(self) -> str:
+        """
+        Everything the output depends on other than game params, the generator itself and Chinese names for alias
+        """
+        sha1 = hashlib.sha1()
+        for filename in [os.path.abspath(__file__), 'langs/zh_sg_lang.json']:
+            with open(filename, 'rb') as f:
+                sha1.update(f.read())
+        return sha1.hexdigest()
+
+    def _unpack_incremental(self, sections: List[str], workers: int = 1) -> dict:
+        """
+        Only unpack entries that changed since the last run, or look up an entry that changed.
+        Everything else is taken from the last run so the output is the same as unpacking everything.
+        With more than one worker, changed entries are unpacked in a process pool.
+        """
+        filename = 'generate.{}.state'.format(self._read_options['install'])
+        state = IncrementalState(filename, self._incremental_version(), self._params)
+        # entries no section needs don't generate anything
+        species = [s for section in sections for s in self._SECTION_SPECIES.get(section, [])]
+        # every entry in order, None until it is unpacked
+        entries = {}
+        changed = []
+        for key, item in self._params.items():
+            typeinfo = item['typeinfo']
+            if not typeinfo['type'] in self._TYPE_SECTIONS and not typeinfo['species'] in species:
+                continue
+            entries[key] = state.lookup(key, item)
+            if entries[key] is None:
+                changed.append(key)
+
+        if workers > 1 and len(changed) > 1:
+            shards = self._shard(changed, sections, workers)
+            print('Unpacking {} changed entries in {} shards with {} workers...'.format(
+                len(changed), len(shards), workers))
+            results = self._map_shards(_unpack_isolated_shard, shards, workers)
+            unpacked = (result for shard in results for result in shard)
+        else:
+            unpacked = ((key, *self._unpack_isolated(key, self._params[key], sections)) for key in changed)
+        for key, entry, deps in unpacked:
+            state.store(key, entry, deps)
+            entries[key] = entry
+
+        data = self._new_sections(sections)
+        for entry in entries.values():
+            # merge in the same order as unpacking everything
+            for output in entry['data']:
+                data[output].update(entry['data'][output])
+            self._lang_keys.merge(entry['lang_keys'])
+            self._modifiers.update(entry['modifiers'])
+            self._game_info['regions'].update(entry['game_info']['regions'])
+            self._game_info['types'].update(entry['game_info']['types'])
+        # save before anything changes the output, like the title of camoboosts
+        state.save()
+        print('Unpacked {} entries, reused {} entries from the last run'.format(
+            len(changed), len(entries) - len(changed)))
+        return data
+
+    def _english_names(self, wowsinfo: dict, english: dict) -> dict:
+        """
+        Get the English name of the name key of every item in wowsinfo
+        """
+        names = {}
+        for section in wowsinfo.values():
+            if not isinstance(section, dict):
+                continue
+            for item in section.values():
+                if not isinstance(item, dict):
                     continue
+                name = item.get('name')
+                if isinstance(name, str) and name in english:
+                    names[name] = english[name]
+        return names
 
-                # TODO: move to unpack_crews
-                if item['CrewPersonality']['isUnique'] == True:
-                    skills[key] = item
+    def generate(self, game_path: str, sections: List[str] = None, workers: int = 1, incremental: bool = False,
+                 write_wowsinfo: bool = True, shards: str = None, string_table: bool = False) -> dict:
+        """
+        Generate everything from game params. If sections is set, only these sections are
+        generated again and merged into the existing wowsinfo.json, lang.json and modifiers.json.
+        With more than one worker, game params are unpacked in a process pool.
+        With incremental, only entries that changed since the last full generation are unpacked.
+        Returns wowsinfo, it is only written to wowsinfo.json and wowsinfo.bin with write_wowsinfo.
+        With shards (nation or tier), it is also split into shards/ with a shard per section and ships split by shards.
+        With string_table, it is also written to wowsinfo_table.json with repeated strings in a string table.
+        Game params and language tables are released when they are not needed anymore, call read() to generate again.
+        """
+        if self._params is None:
+            raise Exception('Call read() first')
 
-                for s in item['Skills']:
-                    modifiers = item['Skills'][s]['modifiers']
-                    for m in modifiers:
-                        self._modifiers[m] = modifiers[m]
-            elif item_type == 'Gun':
-                # weapons.update(self._unpack_weapons(item, key))
-                continue
-            elif item_type == 'Projectile':
-                projectiles.update(self._unpack_projectiles(item, key))
-            elif item_type == 'Aircraft':
-                aircrafts.update(self._unpack_aircrafts(item, key))
-            elif item_type == 'Ability':
-                abilitites.update(self._unpack_abilities(item, key))
+        partial = sections is not None
+        if partial:
+            for section in sections:
+                if not section in self._SECTION_OUTPUTS:
+                    raise Exception('Unknown section {}, use one of {}'.format(
+                        section, ', '.join(self._SECTION_OUTPUTS)))
+            if not os.path.exists('wowsinfo.json'):
+                raise Exception('wowsinfo.json not found, generate everything first')
+        else:
+            sections = list(self._SECTION_OUTPUTS)
+
+        with self._stage('unpack'):
+            if incremental and not partial:
+                data = self._unpack_incremental(sections, workers)
+            elif workers > 1:
+                keys = self._section_keys(sections) if partial else self._params_keys
+                data = self._unpack_parallel(keys, sections, workers)
+            else:
+                data = self._new_sections(sections)
+                if partial:
+                    params = ((key, self._params[key]) for key in self._section_keys(sections))
+                else:
+                    # entries are streamed in file order when reading with stream
+                    params = self._params.items()
+                for key, item in params:
+                    self._unpack_item(key, item, data)
+                # it holds on to game params as well
+                del params
+            if 'projectiles' in data:
+                # drag of HE and SAP is not in projectiles so this needs game params as well
+                with self._stage('ballistics'):
+                    self._add_ballistics(data['projectiles'])
+            # nothing needs game params anymore, read() has to be called again to generate again
+            self._params = None
+            self._params_keys = None
+            self._index = None
+            self._component_memo = {}
+        components = self._component_hits + self._component_misses
+        if components > 0:
+            print('Reused {} of {} ship components ({:.0%})'.format(
+                self._component_hits, components, self._component_hits / components))
 
         # save everything
-        if len(ships) == 0:
+        if 'ships' in data and len(data['ships']) == 0:
             raise Exception('No ships found. Data is not valid')
 
-        # add the name in Chinese as title
-        for camo in camoboost:
-            curr = camoboost[camo]
-            curr['title'] = self._lang_sg[self._IDS(curr['name'])]
-        print("There are {} camoboosts in the game".format(len(camoboost)))
-        self._write_json(camoboost, 'camoboost.json')
-        print("There are {} dog tags in the game".format(len(dog_tag)))
-        self._write_json(dog_tag, 'dog_tag.json')
-
-        print("There are {} ships in the game".format(len(ships)))
-        self._write_json(ships, 'ships.json')
-        print("There are {} achievements in the game".format(len(achievements)))
-        self._write_json(achievements, 'achievements.json')
-        print("There are {} exteriors in the game".format(len(exteriors)))
-        self._write_json(exteriors, 'exteriors.json')
-        print("There are {} modernizations in the game".format(len(modernizations)))
-        self._write_json(modernizations, 'modernizations.json')
-        print("There are {} weapons in the game".format(len(weapons)))
-        self._write_json(weapons, 'weapons.json')
-        print("There are {} projectiles in the game".format(len(projectiles)))
-        self._write_json(projectiles, 'projectiles.json')
-        print("There are {} aircrafts in the game".format(len(aircrafts)))
-        self._write_json(aircrafts, 'aircrafts.json')
-        print("There are {} abilities in the game".format(len(abilitites)))
-        self._write_json(abilitites, 'abilities.json')
-        print("There are {} Japanese alias in the game".format(len(alias)))
-        self._write_json(alias, 'alias.json')
-        print("There are {} ship index in the game".format(len(ship_index)))
-        self._write_json(ship_index, 'ship_index.json')
+        if 'ships' in data:
+            # projectiles are from the last run when only ships are generated again
+            projectiles = data.get('projectiles')
+            if projectiles is None and os.path.exists('projectiles.json'):
+                projectiles = self._read_json('projectiles.json')
+            if projectiles is None:
+                print('projectiles.json not found, ships are saved without derived stats')
+            else:
+                with self._stage('derived'):
+                    add_derived_stats(data['ships'], projectiles)
+                del projectiles
+
+        if 'camoboost' in data:
+            camoboost = data['camoboost']
+            # add the name in Chinese as title
+            for camo in camoboost:
+                curr = camoboost[camo]
+                curr['title'] = self._lang_sg[self._IDS(curr['name'])]
+            print("There are {} camoboosts in the game".format(len(camoboost)))
+            self._write_json(camoboost, 'camoboost.json')
+        if 'dog_tag' in data:
+            print("There are {} dog tags in the game".format(len(data['dog_tag'])))
+            self._write_json(data['dog_tag'], 'dog_tag.json')
+
+        if 'ships' in data:
+            print("There are {} ships in the game".format(len(data['ships'])))
+            self._write_json(data['ships'], 'ships.json', 'ships')
+        if 'achievements' in data:
+            print("There are {} achievements in the game".format(len(data['achievements'])))
+            self._write_json(data['achievements'], 'achievements.json', 'achievements')
+        if 'exteriors' in data:
+            print("There are {} exteriors in the game".format(len(data['exteriors'])))
+            self._write_json(data['exteriors'], 'exteriors.json', 'exteriors')
+        if 'modernizations' in data:
+            print("There are {} modernizations in the game".format(len(data['modernizations'])))
+            self._write_json(data['modernizations'], 'modernizations.json', 'modernizations')
+        if not partial:
+            weapons = {}
+            print("There are {} weapons in the game".format(len(weapons)))
+            self._write_json(weapons, 'weapons.json')
+        if 'projectiles' in data:
+            print("There are {} projectiles in the game".format(len(data['projectiles'])))
+            self._write_json(data['projectiles'], 'projectiles.json', 'projectiles')
+        if 'aircrafts' in data:
+            print("There are {} aircrafts in the game".format(len(data['aircrafts'])))
+            self._write_json(data['aircrafts'], 'aircrafts.json', 'aircrafts')
+        if 'abilities' in data:
+            print("There are {} abilities in the game".format(len(data['abilities'])))
+            self._write_json(data['abilities'], 'abilities.json', 'abilities')
+        if 'alias' in data:
+            print("There are {} Japanese alias in the game".format(len(data['alias'])))
+            self._write_json(data['alias'], 'alias.json', 'alias')
+        if 'ship_index' in data:
+            print("There are {} ship index in the game".format(len(data['ship_index'])))
+            self._write_json(data['ship_index'], 'ship_index.json')
         print("We need {} language keys".format(len(self._lang_keys)))
         print("There are {} modifieris in the game".format(len(self._modifiers)))
         # get all modifier names
@@ -1268,95 +1712,216 @@ class WoWsGenerate:
                 self._modifiers[m + '_name'] = 'UNKNOWN!!!'
                 continue
             self._modifiers[m + '_name'] = self._lang[modifier_name]
+        if partial and os.path.exists('modifiers.json'):
+            # keep modifiers from sections we didn't generate again
+            modifiers = self._read_json('modifiers.json')
+            modifiers.update(self._modifiers)
+            self._modifiers = modifiers
         sorted_modifiers = dict(sorted(self._modifiers.items()))
         self._write_json(sorted_modifiers, 'modifiers.json')
-        print("Save game info")
-        self._convert_game_info()
-        self._write_json(self._game_info, 'game_info.json')
-
-        for key in self._lang.keys():
-            # get all modifiers
-            if self._match(key, ['IDS_PARAMS_MODIFIER_', 'IDS_MODULE_TYPE_', 'IDS_CAROUSEL_APPLIED_', 'IDS_SHIP_PARAM_', 'IDS_SKILL_', 'IDS_DOCK_RAGE_MODE_'], lambda x, y: x.startswith(y)):
-                self._lang_keys.append(key)
-            self._lang_keys += self._unpack_language()
-
-        lang_file = {}
-        # prepare for all languages
-        all_langs = self._read_supported_langs()
-        all_langs_keys = list(all_langs.keys())
-        for key in all_langs_keys:
-            lang_file[key] = {}
-
-        for key in self._lang_keys:
-            try:
-                for lang in all_langs_keys:
-                    lang_file[lang][key] = all_langs[lang][key]
-            except KeyError:
-                # TODO: there are too many missing keys, there are seems to be lots of missing data
-                # TODO: maybe, we need to validate language key everytime we generate it, we should allow missing data
-                print('Missing {}'.format(key))
+        if 'ships' in data:
+            print("Save game info")
+            self._convert_game_info()
+            self._write_json(self._game_info, 'game_info.json', 'game')
+
+        with self._stage('lang'):
+            self._lang_keys.use('extra')
+            self._lang_keys.update(self._unpack_language())
+            self._lang_keys.use('lang')
+            # get all modifiers and more, see lang_keys.rules
+            self._lang_keys.update(self._lang_matcher.filter(self._lang.keys()))
+            # this was the last use of the English and Chinese tables, build_lang reads what it needs again
+            self._lang = None
+            self._lang_sg = None
+
+            # only keep the keys we need while reading all languages in parallel
+            fallbacks = {values[0]: values[1:] for values in self._lang_rules.get('fallback', [])}
+            lang_file, missing = build_lang(self._supported_lang_files(), list(self._lang_keys), fallbacks)
+            if partial and os.path.exists('lang.json'):
+                # keep keys from sections we didn't generate again
+                existing = self._read_json('lang.json')
+                for lang in lang_file:
+                    strings = existing.get(lang, {})
+                    strings.update(lang_file[lang])
+                    lang_file[lang] = strings
+
+        # write where they are from once instead of printing every key,
+        # always write it so a report from an earlier run doesn't stay when nothing is missing
+        report = self._lang_keys.missing_report(missing)
+        self._write_json(report, 'missing_lang.json')
+        if len(missing) > 0:
+            by_section = ', '.join('{} {}'.format(count, section) for section, count in report['sections'].items())
+            print('Missing {} language keys ({}), see missing_lang.json'.format(len(missing), by_section))
         self._write_json(lang_file, 'lang.json')
 
         # game_maps = self._unpack_game_map()
         # print("There are {} game maps in the game".format(len(game_maps)))
         # self._write_json(game_maps, 'game_maps.json')
 
-        commander_skills = self._unpack_commander_skills(skills)
-        print("There are {} commander skills in the game".format(
-            len(commander_skills)))
-        self._write_json(commander_skills, 'commander_skills.json')
-        skills = commander_skills['PAW001_DefaultCrew']['Skills']
-        for skill in skills:
-            # split when there is a capital letter with regex
-            name = re.split(r'(?=[A-Z])', skill)[1:]
-            name = '_'.join(name).upper()
-            skills[skill]['name'] = 'IDS_SKILL_' + name
-            skills[skill]['description'] = 'IDS_SKILL_DESC_' + name
-        print("There are {} skills in the game".format(len(skills)))
-        self._write_json(skills, 'skills.json')
-
-        total_size = 0
-        for json_name in glob.glob('*.json'):
-            if 'GameParams' in json_name or 'wowsinfo' in json_name:
-                continue
-            total_size += self._sizeof_json(json_name)
+        if 'commander_skills' in data:
+            commander_skills = self._unpack_commander_skills(data['commander_skills'])
+            print("There are {} commander skills in the game".format(
+                len(commander_skills)))
+            self._write_json(commander_skills, 'commander_skills.json')
+            skills = commander_skills['PAW001_DefaultCrew']['Skills']
+            for skill in skills:
+                # split when there is a capital letter with regex
+                name = re.split(r'(?=[A-Z])', skill)[1:]
+                name = '_'.join(name).upper()
+                skills[skill]['name'] = 'IDS_SKILL_' + name
+                skills[skill]['description'] = 'IDS_SKILL_DESC_' + name
+            print("There are {} skills in the game".format(len(skills)))
+            self._write_json(skills, 'skills.json', 'skills')
+            data['skills'] = skills
+
         # total size in MB
-        print("Total size: {:.2f} MB".format(total_size))
+        total_size = self.writer.total_size(exclude=('GameParams', 'wowsinfo'))
+        print("Total size: {:.2f} MB".format(total_size / 1024 / 1024))
 
         # merge everything into one file
-        wowsinfo = {}
-        wowsinfo['ships'] = ships
-        wowsinfo['achievements'] = achievements
-        wowsinfo['exteriors'] = exteriors
-        wowsinfo['modernizations'] = modernizations
+        if partial:
+            # only replace sections we generated again
+            wowsinfo = self._read_json('wowsinfo.json')
+        else:
+            wowsinfo = {}
+        for key in ['ships', 'achievements', 'exteriors', 'modernizations', 'projectiles', 'aircrafts', 'abilities', 'alias', 'skills']:
+            if key in data:
+                wowsinfo[key] = data[key]
         # wowsinfo['weapons'] = weapons
-        wowsinfo['projectiles'] = projectiles
-        wowsinfo['aircrafts'] = aircrafts
-        wowsinfo['abilities'] = abilitites
-        wowsinfo['alias'] = alias
         # wowsinfo['commander_skills'] = commander_skills
-        wowsinfo['skills'] = skills
-        wowsinfo['game'] = self._game_info
+        if 'ships' in data:
+            wowsinfo['game'] = self._game_info
         # wowsinfo['game_maps'] = game_maps
 
+        # English names of every item, check_new.py reads this instead of every language in lang.json
+        self._write_json(self._english_names(wowsinfo, lang_file.get('en', {})), 'names.json')
+        del lang_file
+
         # read game_path to get the game version and if it is public test
-        game_info_path = os.path.join(game_path, "game_info.xml")
-        with open(game_info_path, 'r') as f:
-            game_info = f.read()
-            game_version = game_info.split('installed="')[1].split('"')[0]
-            public_test = '<id>WOWS.PT.PRODUCTION</id>' in game_info
+        game_version, public_test = self._read_game_info(game_path)
         wowsinfo['version'] = game_version + ('PT' if public_test else '')
 
         # TODO: to be added to app/data/
-        self._write_json(wowsinfo, 'wowsinfo.json')
+        if write_wowsinfo:
+            with self._stage('write'):
+                self.writer.write_document(wowsinfo, 'wowsinfo.json')
+                # the app can read only what it needs from this one
+                write_bin(wowsinfo, 'wowsinfo.bin')
+                if shards is not None:
+                    write_shards(wowsinfo, 'shards', shards)
+                if string_table:
+                    write_string_table(wowsinfo, 'wowsinfo_table.json')
         print("Done")
+        return wowsinfo
     #endregion
 
+#region Workers
+# the generator used by worker processes, forked workers inherit it from the main process
+_worker_generator: WoWsGenerate = None
+
+
+def _init_worker(read_options: dict, profile: bool):
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = WoWsGenerate()
+        if profile:
+            _worker_generator.enable_profile()
+        _worker_generator.read(**read_options)
+
+
+def _reset_worker() -> WoWsGenerate:
+    """
+    Start a shard with empty collectors, the main process merges them in order
+    """
+    generator = _worker_generator
+    generator._lang_keys = LangKeyRegistry()
+    generator._modifiers = {}
+    generator._game_info = {'regions': {}, 'types': {}}
+    if generator._profiler is not None:
+        generator._profiler.reset()
+    generator._component_hits = 0
+    generator._component_misses = 0
+    return generator
+
+
+def _worker_stats(generator: WoWsGenerate) -> tuple:
+    profile = generator._profiler.report() if generator._profiler is not None else None
+    return profile, (generator._component_hits, generator._component_misses)
+
+
+def _unpack_shard(shard: tuple) -> tuple:
+    """
+    Unpack a shard of game params keys with empty collectors, the main process merges them in order
+    """
+    keys, sections = shard
+    generator = _reset_worker()
+    data = generator._new_sections(sections)
+    for key in keys:
+        generator._unpack_item(key, generator._params[key], data)
+    collected = (data, generator._lang_keys, generator._modifiers, generator._game_info)
+    return (collected, *_worker_stats(generator))
+
+
+def _unpack_isolated_shard(shard: tuple) -> tuple:
+    """
+    Unpack every entry of a shard on its own for the incremental state, returns key, entry and dependencies of each
+    """
+    keys, sections = shard
+    generator = _reset_worker()
+    results = [(key, *generator._unpack_isolated(key, generator._params[key], sections)) for key in keys]
+    return (results, *_worker_stats(generator))
+#endregion
+
 #region Main
 # %%
 if __name__ == '__main__':
     import sys
     path = sys.argv[1]
+    # only keep one game params entry in memory at a time
+    stream = '--stream' in sys.argv
+    # always parse GameParams-0.json again
+    cache = '--no-cache' not in sys.argv
     generate = WoWsGenerate()
-    generate.read().generate(path)
+    _, public_test = generate._read_game_info(path)
+    install = 'pt' if public_test else 'live'
+    # only generate some sections again, like --sections ships,projectiles
+    sections = None
+    if '--sections' in sys.argv:
+        sections = sys.argv[sys.argv.index('--sections') + 1].split(',')
+    # unpack with multiple processes, like --workers 4
+    workers = 1
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    # unpack everything again instead of reusing entries that didn't change
+    incremental = '--full' not in sys.argv
+    # also split wowsinfo.json into shards, ships by --shards nation or --shards tier
+    shards = None
+    if '--shards' in sys.argv:
+        shards = sys.argv[sys.argv.index('--shards') + 1]
+    # also write wowsinfo_table.json, see string_table.py
+    string_table = '--string-table' in sys.argv
+    # a value every --range-step km in the range tables of shells, like --range-step 0.5
+    if '--range-step' in sys.argv:
+        generate.ballistics = Ballistics(range_step=float(sys.argv[sys.argv.index('--range-step') + 1]))
+    # time every stage and handler, with --pstats cProfile is used as well
+    profiler = None
+    if '--profile' in sys.argv:
+        profiler = generate.enable_profile(Profiler(pstats='--pstats' in sys.argv))
+    # measure memory of every stage, with --memory-budget 4096 it stops when more than 4096 MB is used
+    memory = None
+    if '--memory' in sys.argv or '--memory-budget' in sys.argv:
+        budget = None
+        if '--memory-budget' in sys.argv:
+            budget = int(sys.argv[sys.argv.index('--memory-budget') + 1]) * 1024 * 1024
+        memory = generate.enable_memory(MemoryTracker(budget))
+    generate.read(stream=stream, cache=cache, install=install).generate(path, sections, workers, incremental,
+                                                                        shards=shards, string_table=string_table)
+    if profiler is not None:
+        profiler.print_summary()
+        profiler.write('generate.profile.json', 'generate.pstats')
+        print('Profile written to generate.profile.json')
+    if memory is not None:
+        memory.print_summary()
+        memory.write('generate.memory.json')
+        print('Memory written to generate.memory.json')
 #endregion
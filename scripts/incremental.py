@@ -0,0 +1,89 @@
+"""
+Remember what each game params entry generated last time so only changed entries are unpacked again
+"""
+import hashlib
+import os
+import pickle
+
+import json_codec
+
+
+def hash_entry(item: dict) -> str:
+    return hashlib.sha1(json_codec.fast_dumps(item)).hexdigest()
+
+
+class TrackedParams:
+    """
+    Wrap game params and remember every key that is looked up
+    """
+
+    def __init__(self, params):
+        self._params = params
+        self.used = set()
+
+    def __contains__(self, key: str) -> bool:
+        self.used.add(key)
+        return key in self._params
+
+    def __getitem__(self, key: str) -> dict:
+        self.used.add(key)
+        return self._params[key]
+
+
+class IncrementalState:
+    """
+    The hash, dependencies and output of every entry from the last run. An entry can be reused if
+    neither the entry itself nor any entry it looked up (like the modules of a ship) has changed.
+    Everything is discarded when version changes, like when the generator itself is updated.
+    """
+
+    def __init__(self, filename: str, version: str, params):
+        self._filename = filename
+        self._version = version
+        self._params = params
+        self._hashes = {}
+        self._entries = {}
+        self._new_entries = {}
+
+        if os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                state = pickle.load(f)
+            if state['version'] == version:
+                self._entries = state['entries']
+            else:
+                print('Generator or languages changed, unpacking everything again')
+
+    def _hash(self, key: str) -> str:
+        """
+        Hash of the current entry, None if it doesn't exist anymore
+        """
+        if key not in self._hashes:
+            self._hashes[key] = hash_entry(self._params[key]) if key in self._params else None
+        return self._hashes[key]
+
+    def lookup(self, key: str, item: dict) -> dict:
+        """
+        Get what the entry generated last time if nothing it depends on has changed
+        """
+        self._hashes[key] = hash_entry(item)
+        entry = self._entries.get(key)
+        if entry is None or entry['hash'] != self._hashes[key]:
+            return None
+        for dep, dep_hash in entry['deps'].items():
+            if self._hash(dep) != dep_hash:
+                return None
+        # still valid, keep it for the next run as well
+        self._new_entries[key] = entry
+        return entry
+
+    def store(self, key: str, entry: dict, deps: set):
+        entry['hash'] = self._hash(key)
+        entry['deps'] = {dep: self._hash(dep) for dep in deps if dep != key}
+        self._new_entries[key] = entry
+
+    def save(self):
+        # entries we didn't see this time are gone from game params
+        temp_path = self._filename + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': self._version, 'entries': self._new_entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self._filename)
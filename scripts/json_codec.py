@@ -0,0 +1,150 @@
+"""
+Read and write json with the fastest library that is installed. Everything is read with orjson if it is there,
+except read_keys which only keeps some keys of a big object.
+Everything is written with json because orjson doesn't use the same format (separators and numbers like 1e+16),
+so the output is always the same as json.dumps(data, ensure_ascii=False).
+"""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = json.JSONEncoder(ensure_ascii=False)
+_ascii_encoder = json.JSONEncoder()
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+def _json_loads(data):
+    if isinstance(data, bytes):
+        data = data.decode('utf8')
+    return json.loads(data)
+
+
+def _orjson_loads(data):
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN, Infinity and numbers larger than 64 bits are only supported by json
+        return _json_loads(data)
+
+
+def _json_fast_dumps(data) -> bytes:
+    return _ascii_encoder.encode(data).encode('utf8')
+
+
+def _orjson_fast_dumps(data) -> bytes:
+    try:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # like numbers larger than 64 bits
+        return _json_fast_dumps(data)
+
+
+# name -> (loads, fast_dumps)
+BACKENDS = {'json': (_json_loads, _json_fast_dumps)}
+if orjson is not None:
+    BACKENDS['orjson'] = (_orjson_loads, _orjson_fast_dumps)
+
+backend = None
+_loads = None
+_fast_dumps = None
+
+
+def use_backend(name: str):
+    """
+    Switch to another backend in BACKENDS, the fastest one is used by default
+    """
+    global backend, _loads, _fast_dumps
+    if not name in BACKENDS:
+        raise Exception('Unknown json backend {}, use one of {}'.format(name, ', '.join(BACKENDS)))
+    backend = name
+    _loads, _fast_dumps = BACKENDS[name]
+
+
+use_backend('orjson' if orjson is not None else 'json')
+
+
+def loads(data):
+    """
+    Parse a str or bytes
+    """
+    return _loads(data)
+
+
+def load(f, object_pairs_hook=None):
+    """
+    Parse a file opened in text or binary mode. Only json supports object_pairs_hook.
+    """
+    if object_pairs_hook is not None:
+        return json.load(f, object_pairs_hook=object_pairs_hook)
+    return _loads(f.read())
+
+
+def read(filename: str, object_pairs_hook=None):
+    with open(filename, 'rb') as f:
+        return load(f, object_pairs_hook)
+
+
+def _expect(text: str, index: int, char: str) -> int:
+    """
+    Skip whitespace and char at index, return where the next value starts
+    """
+    index = _whitespace.match(text, index).end()
+    if text[index:index + 1] != char:
+        raise json.JSONDecodeError('Expecting {!r}'.format(char), text, index)
+    return _whitespace.match(text, index + 1).end()
+
+
+def read_keys(filename: str, keys: set) -> dict:
+    """
+    Read a json object and only keep keys. It goes through the object one pair at a time and drops
+    every value it doesn't keep right away, so only the text and the kept values are in memory.
+    Parsing everything with orjson is about 4x faster but needs memory for the whole object.
+    """
+    with open(filename, 'r', encoding='utf8') as f:
+        text = f.read()
+    result = {}
+    index = _expect(text, 0, '{')
+    if text[index:index + 1] == '}':
+        return result
+    while True:
+        if text[index:index + 1] != '"':
+            raise json.JSONDecodeError('Expecting property name enclosed in double quotes', text, index)
+        key, index = json.decoder.scanstring(text, index + 1)
+        index = _expect(text, index, ':')
+        try:
+            value, index = _decoder.scan_once(text, index)
+        except StopIteration as e:
+            raise json.JSONDecodeError('Expecting value', text, e.value) from None
+        if key in keys:
+            result[key] = value
+        index = _whitespace.match(text, index).end()
+        if text[index:index + 1] == '}':
+            return result
+        index = _expect(text, index, ',')
+
+
+def dumps(data, ensure_ascii: bool = False) -> str:
+    """
+    Same as json.dumps(data, ensure_ascii=ensure_ascii)
+    """
+    if ensure_ascii:
+        return _ascii_encoder.encode(data)
+    return _encoder.encode(data)
+
+
+def write(data, filename: str, ensure_ascii: bool = False):
+    with open(filename, 'w', encoding='utf8') as f:
+        f.write(dumps(data, ensure_ascii))
+
+
+def fast_dumps(data) -> bytes:
+    """
+    Encode data as fast as possible when only the content matters, like for hashing.
+    The format depends on the backend so it must not be written anywhere.
+    """
+    return _fast_dumps(data)
@@ -2,14 +2,19 @@
 Build the language key for the Kotlin language.
 """
 
-import json
+import os
+import sys
+
+# json_codec is in scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_codec
 
 def build_key(json_path: str):
     """
     Build the language key for the Kotlin language.
     """
     with open(json_path, "r", encoding="utf-8") as file:
-        data = json.load(file)
+        data = json_codec.load(file)
     keys = []
     TO_REMOTE = ["(", ")", "/", "."]
     for lang in data["en"]:
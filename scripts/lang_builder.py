@@ -0,0 +1,58 @@
+"""
+Build lang.json from all supported languages with only the keys we need
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Set
+
+import json_codec
+
+
+def read_lang_keys(filename: str, keys: Set[str]) -> dict:
+    """
+    Read a language file and only keep keys
+    """
+    return json_codec.read_keys(filename, keys)
+
+
+def build_lang(lang_files: Dict[str, str], keys: List[str], fallbacks: Dict[str, List[str]]) -> tuple:
+    """
+    Get all keys for each language in lang_files (language -> filename). A key missing in a language
+    is taken from its fallback languages in order, like zh_tw -> zh_sg -> en.
+    Returns the lang dict and the languages each missing key is missing from.
+    """
+    # fallback languages have to be read as well even if they are not supported
+    to_read = dict(lang_files)
+    lang_dir = os.path.dirname(next(iter(lang_files.values()), ''))
+    for lang in lang_files:
+        for fallback in fallbacks.get(lang, []):
+            filename = os.path.join(lang_dir, '{}_lang.json'.format(fallback))
+            if fallback not in to_read and os.path.exists(filename):
+                to_read[fallback] = filename
+
+    wanted = set(keys)
+    tables = {}
+    # parsing is CPU bound so each language gets its own process
+    with ProcessPoolExecutor(max(1, len(to_read))) as pool:
+        futures = {}
+        for lang, filename in to_read.items():
+            print('Reading language {}...'.format(lang))
+            futures[lang] = pool.submit(read_lang_keys, filename, wanted)
+        for lang in futures:
+            tables[lang] = futures[lang].result()
+
+    chains = {}
+    for lang in lang_files:
+        chains[lang] = [tables[l] for l in [lang] + fallbacks.get(lang, []) if l in tables]
+
+    lang_dict = {lang: {} for lang in lang_files}
+    missing = {}
+    for key in keys:
+        for lang in lang_files:
+            for table in chains[lang]:
+                if key in table:
+                    lang_dict[lang][key] = table[key]
+                    break
+            else:
+                missing.setdefault(key, []).append(lang)
+    return lang_dict, missing
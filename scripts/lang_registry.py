@@ -0,0 +1,108 @@
+"""
+Collect all language keys we need once and remember where they are from
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+
+class LangKeyRegistry:
+    """
+    An ordered set of language keys. Each key remembers how many times it was requested
+    and the first few sections and items that requested it.
+    """
+
+    # only keep a few sources per key, nation and type keys are requested by every ship
+    MAX_SOURCES = 3
+
+    def __init__(self):
+        # key -> [count, [(section, item), ...]]
+        self._keys = {}
+        self._section = None
+        self._item = None
+        # keys added since record() started, in order
+        self._recording = None
+
+    def use(self, section: str, item: str = None):
+        """
+        Keys added after this are from section and item
+        """
+        self._section = section
+        self._item = item
+
+    def add(self, key: str):
+        if self._recording is not None:
+            self._recording.append(key)
+        entry = self._keys.get(key)
+        if entry is None:
+            self._keys[key] = [1, [(self._section, self._item)]]
+            return
+
+        entry[0] += 1
+        if len(entry[1]) < self.MAX_SOURCES:
+            source = (self._section, self._item)
+            if source not in entry[1]:
+                entry[1].append(source)
+
+    def update(self, keys: Iterable[str]):
+        for key in keys:
+            self.add(key)
+
+    @contextmanager
+    def record(self):
+        """
+        Get every key added in it in order, update() with them later has the same effect as adding them again
+        """
+        outer = self._recording
+        recorded = self._recording = []
+        try:
+            yield recorded
+        finally:
+            self._recording = outer
+            if outer is not None:
+                outer.extend(recorded)
+
+    def merge(self, other: 'LangKeyRegistry'):
+        """
+        Add all keys from other after the keys we have, in the same order
+        """
+        for key, (count, sources) in other._keys.items():
+            entry = self._keys.get(key)
+            if entry is None:
+                self._keys[key] = [count, list(sources)]
+                continue
+
+            entry[0] += count
+            for source in sources:
+                if len(entry[1]) >= self.MAX_SOURCES:
+                    break
+                if source not in entry[1]:
+                    entry[1].append(source)
+
+    def sources(self, key: str) -> list:
+        return self._keys[key][1]
+
+    def missing_report(self, missing: Dict[str, List[str]]) -> dict:
+        """
+        Get where the missing keys (key -> languages missing it) are from and how many of them each section has
+        """
+        keys = {}
+        sections = {}
+        for key in missing:
+            count, sources = self._keys[key]
+            keys[key] = {
+                'langs': missing[key],
+                'count': count,
+                'from': [{'section': s, 'item': i} for s, i in sources],
+            }
+            section = sources[0][0]
+            sections[section] = sections.get(section, 0) + 1
+        return {'total': len(missing), 'sections': sections, 'keys': keys}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
@@ -0,0 +1,96 @@
+"""
+Measure how much memory the generator uses in each stage with tracemalloc, and stop when it uses too much
+"""
+import tracemalloc
+from contextlib import contextmanager
+
+import json_codec
+
+
+def _new_stat() -> dict:
+    return {'peak': 0, 'retained': 0, 'calls': 0}
+
+
+def _mb(size: int) -> str:
+    return '{:.2f} MB'.format(size / 1024 / 1024)
+
+
+class MemoryTracker:
+    """
+    Stages are measured with stage() and can be nested, like unpack.ships in unpack.
+    The peak of a stage is the most memory traced at any time in it, retained is how much more
+    is traced after it than before it. A stage entered more than once keeps its highest peak
+    and adds up what it retained. With a budget in bytes, an exception with every stage so far
+    is raised as soon as a stage ends above it.
+    """
+
+    def __init__(self, budget: int = None):
+        self.budget = budget
+        # name -> peak, retained and calls
+        self.stages = {}
+        # the peak so far of every stage we are in, innermost last
+        self._peaks = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        current, peak = tracemalloc.get_traced_memory()
+        # the stage we are in keeps its peak before it is reset for this one
+        if len(self._peaks) > 0:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(current)
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            peak = max(self._peaks.pop(), peak)
+            if len(self._peaks) > 0:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+
+            stat = self.stages.get(name)
+            if stat is None:
+                stat = self.stages[name] = _new_stat()
+            stat['peak'] = max(stat['peak'], peak)
+            stat['retained'] += after - current
+            stat['calls'] += 1
+        # not in finally, an exception from the stage itself is more useful
+        if self.budget is not None and peak > self.budget:
+            raise Exception('{} went over the memory budget of {} with {}\n{}'.format(
+                name, _mb(self.budget), _mb(peak), '\n'.join(self.breakdown())))
+
+    def wrap(self, obj, method: str, stage_of):
+        """
+        Measure every call of method on obj as the stage stage_of returns for its arguments,
+        calls it returns None for are not measured
+        """
+        original = getattr(obj, method)
+
+        def wrapper(*args, **kwargs):
+            name = stage_of(*args, **kwargs)
+            if name is None:
+                return original(*args, **kwargs)
+            with self.stage(name):
+                return original(*args, **kwargs)
+        setattr(obj, method, wrapper)
+
+    def report(self) -> dict:
+        return {
+            'budget': self.budget,
+            'stages': dict(self.stages),
+        }
+
+    def breakdown(self) -> list:
+        lines = []
+        for name, stat in self.stages.items():
+            lines.append('{}: peak {}, retained {}'.format(name, _mb(stat['peak']), _mb(stat['retained'])))
+        return lines
+
+    def write(self, filename: str):
+        json_codec.write(self.report(), filename)
+
+    def print_summary(self):
+        for line in self.breakdown():
+            print(line)
@@ -0,0 +1,68 @@
+"""
+Cache parsed game params next to the source file so a rerun doesn't have to parse the json again
+"""
+import glob
+import hashlib
+import os
+import pickle
+from typing import Callable
+
+
+class ParamsCache:
+    """
+    Store parsed game params as a pickle keyed by the hash of the source file.
+    Only the last `keep` versions are kept for each install (live / pt).
+    """
+
+    def __init__(self, source: str, install: str, keep: int = 2):
+        self._source = source
+        self._install = install
+        self._keep = keep
+        folder, filename = os.path.split(os.path.abspath(source))
+        self._prefix = os.path.join(folder, '{}.{}.'.format(os.path.splitext(filename)[0], install))
+
+    def load(self, loader: Callable[[], dict]) -> dict:
+        """
+        Return the cached params if the source didn't change, otherwise call loader and cache the result
+        """
+        path = self._cache_path(self._hash())
+        if os.path.exists(path):
+            print('Loading game params from {}'.format(os.path.basename(path)))
+            with open(path, 'rb') as f:
+                params = pickle.load(f)
+            # mark as the most recently used version
+            os.utime(path)
+            return params
+
+        params = loader()
+        self._store(path, params)
+        self._evict()
+        return params
+
+    def _hash(self) -> str:
+        sha1 = hashlib.sha1()
+        with open(self._source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def _cache_path(self, digest: str) -> str:
+        return '{}{}.pickle'.format(self._prefix, digest[:16])
+
+    def _store(self, path: str, params: dict):
+        print('Caching game params to {}'.format(os.path.basename(path)))
+        # write to a temp file first so a crash never leaves a broken cache behind
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(params, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def _evict(self):
+        """
+        Only keep the last N versions of this install
+        """
+        cached = glob.glob(glob.escape(self._prefix) + '*.pickle')
+        cached.sort(key=os.path.getmtime, reverse=True)
+        for path in cached[self._keep:]:
+            print('Removing old cache {}'.format(os.path.basename(path)))
+            os.remove(path)
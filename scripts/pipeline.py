@@ -0,0 +1,215 @@
+"""
+Run every step from unpacking the game to wowsinfo.json in one process
+"""
+import os
+import subprocess
+import sys
+from contextlib import ExitStack
+from typing import Callable
+
+from additional import runAll
+from check_new import compare_new
+from clean import clean
+from generate import WoWsGenerate
+from memory import MemoryTracker
+from profiler import Profiler
+from shards import write_shards
+from string_table import write_string_table
+from unpack import unpack
+from wowsinfo_bin import write_bin
+
+
+def _run_command(command: str):
+    subprocess.run(command, shell=True, check=True)
+
+
+class Pipeline:
+    """
+    Run clean, unpack, generate, additional and check_new one after another. wowsinfo is passed
+    from one stage to the next in memory and wowsinfo.json is only written once at the end.
+    With isolated, every stage runs in its own interpreter and reads / writes wowsinfo.json itself.
+    With shards (nation or tier), wowsinfo is also split into shards/.
+    With string_table, it is also written to wowsinfo_table.json with a string table.
+    With profile, every stage and the handlers of generate are timed and written to pipeline.profile.json,
+    with pstats cProfile is used as well.
+    With memory, the memory of every stage is measured and written to pipeline.memory.json,
+    with memory_budget (MB) it stops as soon as a stage uses more than that.
+    With full, generate unpacks everything again instead of only entries that changed since the last run.
+    With stream, generate only keeps one game params entry in memory at a time,
+    without cache, GameParams-0.json is always parsed again.
+    """
+
+    STAGES = ['clean', 'unpack', 'generate', 'additional', 'check_new', 'write']
+
+    def __init__(self, game_path: str, public_test: bool, isolated: bool = False, workers: int = 1,
+                 python_path: str = sys.executable, run_command: Callable[[str], None] = _run_command,
+                 shards: str = None, string_table: bool = False, profile: bool = False, pstats: bool = False,
+                 memory: bool = False, memory_budget: int = None, full: bool = False, stream: bool = False,
+                 cache: bool = True):
+        self.game_path = game_path
+        self.public_test = public_test
+        self.isolated = isolated
+        self.workers = workers
+        self.python_path = python_path
+        self.run_command = run_command
+        self.shards = shards
+        self.string_table = string_table
+        self.profile = profile
+        self.pstats = pstats
+        self.profiler = None
+        self.memory = memory or memory_budget is not None
+        self.memory_budget = memory_budget
+        self.memory_tracker = None
+        self.full = full
+        self.stream = stream
+        self.cache = cache
+        self.wowsinfo = None
+        # sections generate has written, wowsinfo.json is put together from their files
+        self.writer = None
+
+    def run(self) -> dict:
+        if self.profile:
+            self.profiler = Profiler(pstats=self.pstats)
+        if self.memory and not self.isolated:
+            budget = self.memory_budget * 1024 * 1024 if self.memory_budget is not None else None
+            self.memory_tracker = MemoryTracker(budget)
+        for stage in self.STAGES:
+            print('Running {}...'.format(stage))
+            with self._stage('pipeline.' + stage):
+                if self.isolated:
+                    self._run_isolated(stage)
+                else:
+                    getattr(self, '_' + stage)()
+
+        if self.profiler is not None:
+            self.profiler.print_summary()
+            self.profiler.write('pipeline.profile.json', 'pipeline.pstats')
+            print('Profile written to pipeline.profile.json')
+        if self.memory_tracker is not None:
+            self.memory_tracker.print_summary()
+            self.memory_tracker.write('pipeline.memory.json')
+            print('Memory written to pipeline.memory.json')
+        return self.wowsinfo
+
+    def _stage(self, name: str):
+        stage = ExitStack()
+        if self.profiler is not None:
+            stage.enter_context(self.profiler.stage(name))
+        if self.memory_tracker is not None:
+            stage.enter_context(self.memory_tracker.stage(name))
+        return stage
+
+    def _backup_file(self) -> str:
+        return 'wowsinfo.json.pt' if self.public_test else 'wowsinfo.json.live'
+
+    def _run_isolated(self, stage: str):
+        commands = {
+            'clean': 'clean.py',
+            'unpack': 'unpack.py ' + self.game_path,
+            'generate': 'generate.py {} --workers {}'.format(self.game_path, self.workers),
+            'additional': 'additional.py --all',
+            'check_new': 'check_new.py {}'.format(0 if self.public_test else 1),
+            # every stage writes wowsinfo.json itself, only wowsinfo.bin is left
+            'write': 'wowsinfo_bin.py wowsinfo.json wowsinfo.bin',
+        }
+        if stage == 'check_new' and not os.path.exists(self._backup_file()):
+            return
+        if stage == 'generate':
+            commands[stage] += self._generate_options()
+        if stage == 'generate' and self.profile:
+            # generate.py writes its own profile
+            commands[stage] += ' --profile' + (' --pstats' if self.pstats else '')
+        if stage == 'generate' and self.memory:
+            # and its own memory
+            if self.memory_budget is not None:
+                commands[stage] += ' --memory-budget {}'.format(self.memory_budget)
+            else:
+                commands[stage] += ' --memory'
+        self.run_command(self.python_path + ' ' + commands[stage])
+        if stage == 'write' and self.shards is not None:
+            self.run_command(self.python_path + ' shards.py split wowsinfo.json shards ' + self.shards)
+        if stage == 'write' and self.string_table:
+            self.run_command(self.python_path + ' string_table.py wowsinfo.json wowsinfo_table.json')
+
+    def _generate_options(self) -> str:
+        """
+        Options of generate.py for full, stream and cache
+        """
+        options = ''
+        if self.full:
+            options += ' --full'
+        if self.stream:
+            options += ' --stream'
+        if not self.cache:
+            options += ' --no-cache'
+        return options
+
+    #region Stages
+    def _clean(self):
+        clean()
+
+    def _unpack(self):
+        unpack(self.game_path)
+
+    def _generate(self):
+        generator = WoWsGenerate()
+        if self.profiler is not None:
+            generator.enable_profile(self.profiler)
+        if self.memory_tracker is not None:
+            generator.enable_memory(self.memory_tracker)
+        install = 'pt' if self.public_test else 'live'
+        generator.read(stream=self.stream, cache=self.cache, install=install)
+        self.wowsinfo = generator.generate(self.game_path, workers=self.workers, incremental=not self.full,
+                                           write_wowsinfo=False)
+        self.writer = generator.writer
+
+    def _additional(self):
+        self.wowsinfo = runAll(self.wowsinfo)
+
+    def _check_new(self):
+        # nothing to compare with for the first time
+        if not os.path.exists(self._backup_file()):
+            return
+        self.wowsinfo = compare_new(self.public_test, self.wowsinfo)
+
+    def _write(self):
+        # sections added later like number are encoded here
+        self.writer.write_document(self.wowsinfo, 'wowsinfo.json')
+        write_bin(self.wowsinfo, 'wowsinfo.bin')
+        if self.shards is not None:
+            write_shards(self.wowsinfo, 'shards', self.shards)
+        if self.string_table:
+            write_string_table(self.wowsinfo, 'wowsinfo_table.json')
+    #endregion
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: {} <path to WoWs folder> [--isolated] [--workers N] [--shards nation|tier] [--string-table] [--profile] [--pstats] [--memory] [--memory-budget MB] [--full] [--stream] [--no-cache]'.format(sys.argv[0]))
+        sys.exit(1)
+
+    path = sys.argv[1]
+    with open(os.path.join(path, 'game_info.xml'), 'r') as f:
+        public_test = '<id>WOWS.PT.PRODUCTION</id>' in f.read()
+    # run every stage in its own interpreter like before
+    isolated = '--isolated' in sys.argv
+    workers = 1
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    shards = None
+    if '--shards' in sys.argv:
+        shards = sys.argv[sys.argv.index('--shards') + 1]
+    string_table = '--string-table' in sys.argv
+    profile = '--profile' in sys.argv
+    pstats = '--pstats' in sys.argv
+    memory = '--memory' in sys.argv
+    memory_budget = None
+    if '--memory-budget' in sys.argv:
+        memory_budget = int(sys.argv[sys.argv.index('--memory-budget') + 1])
+    # the same as generate.py
+    full = '--full' in sys.argv
+    stream = '--stream' in sys.argv
+    cache = '--no-cache' not in sys.argv
+    Pipeline(path, public_test, isolated=isolated, workers=workers, shards=shards, string_table=string_table,
+             profile=profile, pstats=pstats, memory=memory, memory_budget=memory_budget, full=full, stream=stream,
+             cache=cache).run()
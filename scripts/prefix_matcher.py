@@ -0,0 +1,40 @@
+"""
+Match text against many prefixes and suffixes with a single compiled regex
+"""
+import re
+from typing import Iterable, List
+
+
+class PrefixMatcher:
+    """
+    Check if text starts with any of the prefixes or ends with any of the suffixes
+    """
+
+    def __init__(self, prefixes: Iterable[str] = (), suffixes: Iterable[str] = ()):
+        self.prefixes = list(prefixes)
+        self.suffixes = list(suffixes)
+
+        patterns = []
+        if len(self.prefixes) > 0:
+            patterns.append('^(?:{})'.format('|'.join(map(re.escape, self.prefixes))))
+        if len(self.suffixes) > 0:
+            patterns.append('(?:{})\\Z'.format('|'.join(map(re.escape, self.suffixes))))
+        # nothing can match without any rules
+        self._regex = re.compile('|'.join(patterns)) if len(patterns) > 0 else None
+        # prefixes alone are anchored so match() is enough, suffixes need search()
+        if self._regex is None:
+            self._match = lambda text: None
+        elif len(self.suffixes) == 0:
+            self._match = self._regex.match
+        else:
+            self._match = self._regex.search
+
+    def match(self, text: str) -> bool:
+        return self._match(text) is not None
+
+    def filter(self, texts: Iterable[str]) -> List[str]:
+        """
+        Get all texts that match, in the same order
+        """
+        match = self._match
+        return [text for text in texts if match(text) is not None]
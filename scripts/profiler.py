@@ -0,0 +1,131 @@
+"""
+Measure where the generator spends its time, by stage, by _unpack_* handler and by game params type
+"""
+import cProfile
+import time
+from contextlib import contextmanager
+from typing import List
+
+import json_codec
+
+
+def _new_stat() -> dict:
+    return {'time': 0.0, 'calls': 0, 'items': 0}
+
+
+class Profiler:
+    """
+    Stages are timed with stage(). Methods are timed by replacing them on an object with wrap(),
+    the time of a handler includes handlers it calls but a handler calling itself is only counted once.
+    Items are the length of what a handler returns, or 1 if it returns something else that is not None.
+    With pstats, everything in this process is also recorded with cProfile.
+    """
+
+    def __init__(self, pstats: bool = False):
+        # name -> seconds
+        self.stages = {}
+        # name -> time, calls and items
+        self.handlers = {}
+        self.item_types = {}
+        # how deep each handler is right now, only the outermost call is timed
+        self._depth = {}
+        self._cprofile = cProfile.Profile() if pstats else None
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def _record(self, stats: dict, name: str, elapsed: float, items: int, timed: bool = True):
+        stat = stats.get(name)
+        if stat is None:
+            stat = stats[name] = _new_stat()
+        stat['calls'] += 1
+        stat['items'] += items
+        if timed:
+            stat['time'] += elapsed
+
+    def _wrap_handler(self, name: str, method):
+        def wrapper(*args, **kwargs):
+            depth = self._depth.get(name, 0)
+            self._depth[name] = depth + 1
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                self._depth[name] = depth
+            elapsed = time.perf_counter() - start
+
+            if isinstance(result, (dict, list)):
+                items = len(result)
+            else:
+                items = 0 if result is None else 1
+            self._record(self.handlers, name, elapsed, items, timed=depth == 0)
+            return result
+        return wrapper
+
+    def _wrap_item(self, method):
+        # method(key, item, data), item is a game params entry
+        def wrapper(key, item, *args, **kwargs):
+            start = time.perf_counter()
+            result = method(key, item, *args, **kwargs)
+            self._record(self.item_types, item['typeinfo']['type'], time.perf_counter() - start, 1)
+            return result
+        return wrapper
+
+    def wrap(self, obj, handlers: List[str], item_method: str = None):
+        """
+        Time handlers of obj, and time item_method by the type of the entry it is called with
+        """
+        for name in handlers:
+            setattr(obj, name, self._wrap_handler(name, getattr(obj, name)))
+        if item_method is not None:
+            setattr(obj, item_method, self._wrap_item(getattr(obj, item_method)))
+
+    def reset(self):
+        """
+        Forget handlers and types, workers start over for every shard
+        """
+        self.handlers = {}
+        self.item_types = {}
+
+    def merge(self, report: dict):
+        """
+        Add handlers and types from a worker, their time is added up across workers
+        """
+        for stats, other in [(self.handlers, report['handlers']), (self.item_types, report['item_types'])]:
+            for name, stat in other.items():
+                total = stats.setdefault(name, _new_stat())
+                for field in total:
+                    total[field] += stat[field]
+
+    def report(self) -> dict:
+        def by_time(stats: dict) -> dict:
+            return dict(sorted(stats.items(), key=lambda item: item[1]['time'], reverse=True))
+
+        return {
+            'stages': dict(self.stages),
+            'handlers': by_time(self.handlers),
+            'item_types': by_time(self.item_types),
+        }
+
+    def write(self, filename: str, pstats_file: str = None):
+        """
+        Write the report to filename, and what cProfile recorded to pstats_file
+        """
+        json_codec.write(self.report(), filename)
+        if self._cprofile is not None and pstats_file is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(pstats_file)
+            self._cprofile.enable()
+
+    def print_summary(self, top: int = 10):
+        for name, seconds in self.stages.items():
+            print('{}: {:.2f}s'.format(name, seconds))
+        for name, stat in list(self.report()['handlers'].items())[:top]:
+            print('{}: {:.2f}s, {} calls, {} items'.format(name, stat['time'], stat['calls'], stat['items']))
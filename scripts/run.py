@@ -1,4 +1,3 @@
-from cProfile import run
 import email
 import os
 import shutil
@@ -6,7 +5,9 @@ import sys
 import time
 import subprocess
 import traceback
+from compress import Compressor, format_report
 from mail import Email
+from pipeline import Pipeline
 
 def log(message):
     """
@@ -119,7 +120,7 @@ def move(src: str, dest: str) -> None:
         os.makedirs(folder_path)
     shutil.move(src, dest)
 
-def generate(path: str) -> None:
+def generate(path: str, isolated: bool = False, profile: bool = False, full: bool = False, stream: bool = False) -> None:
     log("Generating data from {}".format(path))
     public_test = False
     with open(os.path.join(path, "game_info.xml"), "r") as f:
@@ -129,18 +130,15 @@ def generate(path: str) -> None:
         version = game_info.split('available="')[1].split('"')[0]
 
     python_path = 'C:/Users/nateq/Documents/GitHub/automation/.env/Scripts/python.exe'
-    run_command(python_path + ' clean.py')
-    run_command(python_path + ' unpack.py ' + path)
-    run_command(python_path + ' generate.py ' + path)
-    run_command(python_path + ' additional.py --all')
+    # clean, unpack, generate, additional and check_new, in one process unless isolated
+    # ships are split by nation so the app only downloads nations that have changed
+    pipeline = Pipeline(path, public_test, isolated=isolated, python_path=python_path, run_command=run_command,
+                        shards='nation', profile=profile, full=full, stream=stream)
+    pipeline.run()
 
     if public_test:
-        if os.path.exists("wowsinfo.json.pt"):
-            run_command(python_path + ' check_new.py 0')
         shutil.copyfile("wowsinfo.json", "wowsinfo.json.pt")
     else:
-        if os.path.exists("wowsinfo.json.live"):
-            run_command(python_path + ' check_new.py 1')
         shutil.copyfile("wowsinfo.json", "wowsinfo.json.live")
 
     with open('changes.log', 'r', encoding='utf8') as f:
@@ -158,6 +156,13 @@ def generate(path: str) -> None:
     data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), folder_name)
     move('./app', os.path.join(data_path, 'app'))
     move('./wowsinfo.json', os.path.join(data_path, 'app/data/wowsinfo.json'))
+    move('./wowsinfo.bin', os.path.join(data_path, 'app/data/wowsinfo.bin'))
+    move('./shards', os.path.join(data_path, 'app/data/shards'))
+    # new items and the patch since the last update, only there if there is something to compare with
+    if os.path.exists('./added.json'):
+        move('./added.json', os.path.join(data_path, 'app/data/added.json'))
+        move('./patch.json', os.path.join(data_path, 'app/data/patch.json'))
+        move('./changes_detail.log', os.path.join(data_path, 'changes.log'))
     move('./lang.json', os.path.join(data_path, 'app/lang/lang.json'))
 
     # copy over the raw GameParams.data over to the folder
@@ -170,6 +175,13 @@ def generate(path: str) -> None:
     # copy over scripts to scripts folder
     move('./scripts', os.path.join(data_path, 'scripts'))
 
+    # compressed copies so they don't have to be compressed on every request
+    compressed = ['app/data/wowsinfo.json', 'app/lang/lang.json', 'shared/camoboost.json', 'shared/dogtag.json']
+    # move() deletes the old copies with the folder, they are kept in compressed/ so unchanged files are skipped
+    report = Compressor(cache_dir='compressed').compress([os.path.join(data_path, f) for f in compressed])
+    for line in format_report(report):
+        log(line)
+
     # commit and push
     suffix = 'PT' if public_test else ''
     run_command('cd {} && git add .'.format(data_path))
@@ -194,6 +206,14 @@ if __name__ == '__main__':
     if len(sys.argv) > 1:
         if sys.argv[1] == '-f':
             wait_timeout = 1
+    # run every step in its own interpreter
+    isolated = '--isolated' in sys.argv
+    # write how long each stage took to pipeline.profile.json
+    profile = '--profile' in sys.argv
+    # unpack everything again instead of only what changed since the last run
+    full = '--full' in sys.argv
+    # keep only one game params entry in memory at a time
+    stream = '--stream' in sys.argv
 
     # read from game.path
     try:
@@ -202,8 +222,8 @@ if __name__ == '__main__':
             test_path = f.readline().strip()
 
         # force update if needed
-        # generate(public_path)
-        # generate(test_path)
+        # generate(public_path, isolated, profile, full, stream)
+        # generate(test_path, isolated, profile, full, stream)
         # exit()
 
         hasError = False
@@ -211,13 +231,13 @@ if __name__ == '__main__':
         try:
             if has_update(public_path, wait_timeout):
                 wait_for_update(public_path)
-                generate(public_path)
+                generate(public_path, isolated, profile, full, stream)
                 hasUpdate = True
             else:
                 # check if we missed the update
                 if check_if_different(public_path, False):
                     wait_for_update(public_path)
-                    generate(public_path)
+                    generate(public_path, isolated, profile, full, stream)
                     hasUpdate = True
             save_latest_version(public_path, False)
         except Exception as e:
@@ -229,12 +249,12 @@ if __name__ == '__main__':
         try:
             if has_update(test_path, wait_timeout):
                 wait_for_update(test_path)
-                generate(test_path)
+                generate(test_path, isolated, profile, full, stream)
                 hasUpdate = True
             else:
                 # check if we missed the update
                 if check_if_different(test_path, True):
-                    generate(test_path)
+                    generate(test_path, isolated, profile, full, stream)
                     hasUpdate = True
             save_latest_version(test_path, True)
         except Exception as e:
@@ -0,0 +1,113 @@
+"""
+Write every section to its own json file once and put wowsinfo.json together from the same bytes
+"""
+import shutil
+
+import json_codec
+
+
+class SectionWriter:
+    """
+    Encode sections to their own files in chunks, one entry at a time, so the whole string is never in memory.
+    A file written with a section name remembers the section it was written from. When a document like wowsinfo.json
+    has the same section object under that name, the bytes are copied from its file instead of encoding it again,
+    only new sections (like number) are encoded. A section must not be changed after it is written, so write it
+    after its last change. Only sections that are added or lost entries since are caught, checking anything more
+    would mean encoding them again.
+    The output is the same as json.dumps(data, ensure_ascii=False).
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self):
+        # json.dumps only uses the C encoder when everything is encoded at once, so each entry is encoded on its own
+        self._encode = json_codec.dumps
+        # section name -> (section, filename, number of entries when it was written), only sections of documents
+        # are kept and documents have them anyway
+        self._sections = {}
+        # filename -> size in bytes
+        self.sizes = {}
+
+    def _key(self, key) -> str:
+        # convert keys like json.dumps does
+        if isinstance(key, str):
+            return self._encode(key)
+        if key is None or isinstance(key, (int, float)):
+            # numbers, true, false and null become strings
+            return '"{}"'.format(self._encode(key))
+        raise Exception('Key {} of type {} is not supported'.format(key, type(key).__name__))
+
+    def _chunks(self, data):
+        """
+        Encoded data in chunks of about CHUNK_SIZE bytes
+        """
+        if not isinstance(data, dict) or len(data) == 0:
+            yield self._encode(data).encode('utf8')
+            return
+
+        buffer = []
+        buffered = 0
+        separator = '{'
+        for key, value in data.items():
+            entry = separator + self._key(key) + ': ' + self._encode(value)
+            separator = ', '
+            buffer.append(entry)
+            buffered += len(entry)
+            if buffered >= self.CHUNK_SIZE:
+                yield ''.join(buffer).encode('utf8')
+                buffer = []
+                buffered = 0
+        buffer.append('}')
+        yield ''.join(buffer).encode('utf8')
+
+    def write(self, data, filename: str, section: str = None) -> int:
+        """
+        Write data to filename and return its size in bytes. With section, documents can have
+        the bytes of filename as their section with the same name.
+        """
+        size = 0
+        with open(filename, 'wb') as f:
+            for chunk in self._chunks(data):
+                f.write(chunk)
+                size += len(chunk)
+        if section is not None:
+            self._sections[section] = (data, filename, len(data))
+        self.sizes[filename] = size
+        return size
+
+    def write_document(self, document: dict, filename: str) -> int:
+        """
+        Write document with sections from their files where possible and return its size in bytes.
+        Unlike write, document itself is not remembered.
+        """
+        size = 0
+        with open(filename, 'wb') as f:
+            separator = '{'
+            for key, value in document.items():
+                head = (separator + self._key(key) + ': ').encode('utf8')
+                separator = ', '
+                f.write(head)
+                size += len(head)
+
+                written = self._sections.get(key)
+                if written is not None and written[0] is value:
+                    if len(value) != written[2]:
+                        raise Exception('{} was changed after it was written to {}'.format(key, written[1]))
+                    with open(written[1], 'rb') as section:
+                        shutil.copyfileobj(section, f, self.CHUNK_SIZE)
+                    size += self.sizes[written[1]]
+                    continue
+                for chunk in self._chunks(value):
+                    f.write(chunk)
+                    size += len(chunk)
+
+            tail = b'{}' if separator == '{' else b'}'
+            f.write(tail)
+            size += len(tail)
+        return size
+
+    def total_size(self, exclude: tuple = ()) -> int:
+        """
+        Size of all files written so far in bytes, except filenames containing anything in exclude
+        """
+        return sum(size for filename, size in self.sizes.items() if not any(e in filename for e in exclude))
@@ -0,0 +1,125 @@
+"""
+Split wowsinfo into a shard per section, ships are split again by nation or tier.
+manifest.json has the hash and size of every shard so the app only downloads shards that have changed.
+"""
+import hashlib
+import os
+import re
+
+import json_codec
+
+MANIFEST = 'manifest.json'
+# how entries of a section can be split, section -> bucket -> field of each entry
+BUCKETS = {
+    'ships': {
+        'nation': 'region',
+        'tier': 'tier',
+    },
+}
+
+
+def _shard_name(section: str, bucket=None) -> str:
+    if bucket is None:
+        return '{}.json'.format(section)
+    # only keep characters that are safe in a filename
+    bucket = re.sub(r'[^a-z0-9]+', '_', str(bucket).lower()).strip('_')
+    return '{}.{}.json'.format(section, bucket or 'other')
+
+
+def split(wowsinfo: dict, bucket: str = 'nation') -> tuple:
+    """
+    Split wowsinfo into shards (filename -> data) and the manifest without hashes.
+    In the manifest, order has the shard of each entry in a split section as [shard, count] runs.
+    """
+    shards = {}
+    sections = []
+    for name, section in wowsinfo.items():
+        field = BUCKETS.get(name, {}).get(bucket)
+        if field is None or not isinstance(section, dict):
+            filename = _shard_name(name)
+            shards[filename] = section
+            sections.append({'name': name, 'shards': [filename]})
+            continue
+
+        names = []
+        order = []
+        for key, entry in section.items():
+            value = entry.get(field) if isinstance(entry, dict) else None
+            filename = _shard_name(name, value)
+            if filename not in shards:
+                shards[filename] = {}
+                names.append(filename)
+            shards[filename][key] = entry
+
+            index = names.index(filename)
+            if len(order) > 0 and order[-1][0] == index:
+                order[-1][1] += 1
+            else:
+                order.append([index, 1])
+        sections.append({'name': name, 'shards': names, 'order': order})
+    return shards, {'sections': sections}
+
+
+def write_shards(wowsinfo: dict, directory: str, bucket: str = 'nation') -> dict:
+    """
+    Write every shard and manifest.json to directory, shards from the last time that are gone are removed.
+    Returns the manifest.
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    shards, manifest = split(wowsinfo, bucket)
+    manifest['bucket'] = bucket
+    manifest['shards'] = {}
+    for filename, data in shards.items():
+        encoded = json_codec.dumps(data).encode('utf8')
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(encoded)
+        manifest['shards'][filename] = {
+            'sha1': hashlib.sha1(encoded).hexdigest(),
+            'size': len(encoded),
+        }
+
+    for filename in os.listdir(directory):
+        if filename.endswith('.json') and filename != MANIFEST and filename not in shards:
+            os.remove(os.path.join(directory, filename))
+
+    json_codec.write(manifest, os.path.join(directory, MANIFEST))
+    total_size = sum(shard['size'] for shard in manifest['shards'].values())
+    print('Wrote {} shards ({:.2f} MB) to {}'.format(len(shards), total_size / 1024 / 1024, directory))
+    return manifest
+
+
+def assemble(directory: str) -> dict:
+    """
+    Put wowsinfo together from directory, json.dumps(ensure_ascii=False) of it is the same as wowsinfo.json
+    """
+    manifest = json_codec.read(os.path.join(directory, MANIFEST))
+    wowsinfo = {}
+    for section in manifest['sections']:
+        shards = [json_codec.read(os.path.join(directory, filename)) for filename in section['shards']]
+        if 'order' not in section:
+            wowsinfo[section['name']] = shards[0]
+            continue
+
+        # take entries from each shard in the same order as before
+        entries = [iter(shard.items()) for shard in shards]
+        merged = {}
+        for index, count in section['order']:
+            for _ in range(count):
+                key, value = next(entries[index])
+                merged[key] = value
+        wowsinfo[section['name']] = merged
+    return wowsinfo
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 3 or sys.argv[1] not in ['split', 'assemble']:
+        raise Exception('Usage: %s split <wowsinfo.json> <folder> [nation|tier] or %s assemble <folder> <wowsinfo.json>'
+                        % (sys.argv[0], sys.argv[0]))
+
+    if sys.argv[1] == 'split':
+        write_shards(json_codec.read(sys.argv[2]), sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else 'nation')
+    else:
+        json_codec.write(assemble(sys.argv[2]), sys.argv[3])
@@ -0,0 +1,198 @@
+"""
+Encode wowsinfo with a table of strings, repeated strings like IDS_ keys, nations and types are only written once.
+Fields that can be made from another field, like description = name + '_DESCR', are dropped and made again when decoding.
+
+The encoded document looks like
+    {"strings": [...], "fields": [...], "derived": {section: [rule, ...]}, "data": {...}}
+Every value of a field in fields is an index into strings, fields are only used if all their values are strings.
+A rule is [field, source, prefix, suffix, after], the field is prefix + source + suffix and comes after
+the field after (or first when it is null) in every entry of the section.
+"""
+import json_codec
+
+
+def _collect_fields(value, stats: dict):
+    """
+    Count the string values of each field, stats is field -> [only strings, count, unique values]
+    """
+    if isinstance(value, dict):
+        for k, v in value.items():
+            stat = stats.get(k)
+            if stat is None:
+                stat = stats[k] = [True, 0, set()]
+            if isinstance(v, str):
+                stat[1] += 1
+                stat[2].add(v)
+            else:
+                stat[0] = False
+                _collect_fields(v, stats)
+    elif isinstance(value, list):
+        for v in value:
+            _collect_fields(v, stats)
+
+
+def _derived_rules(section: dict) -> list:
+    """
+    Rules for fields that are made from another field in the same way in every entry of section
+    """
+    entries = list(section.values())
+    if len(entries) == 0 or not all(isinstance(entry, dict) for entry in entries):
+        return []
+
+    # everything that holds for the first entry, checked with the others after
+    first = entries[0]
+    keys = list(first)
+    candidates = []
+    for i, field in enumerate(keys):
+        value = first[field]
+        if not isinstance(value, str):
+            continue
+        for source in keys:
+            source_value = first[source]
+            if source == field or not isinstance(source_value, str) or source_value == '':
+                continue
+            start = value.find(source_value)
+            if start < 0 or len(source_value) == len(value):
+                continue
+            after = keys[i - 1] if i > 0 else None
+            candidates.append([field, source, value[:start], value[start + len(source_value):], after])
+
+    rules = []
+    derived = set()
+    for field, source, prefix, suffix, after in candidates:
+        # a field is only made from one source and a source must not be dropped as well
+        if field in derived or source in derived or any(rule[1] == field for rule in rules):
+            continue
+        holds = True
+        for entry in entries:
+            entry_keys = list(entry)
+            if field not in entry or not isinstance(entry.get(source), str):
+                holds = False
+                break
+            index = entry_keys.index(field)
+            if entry[field] != prefix + entry[source] + suffix or (entry_keys[index - 1] if index > 0 else None) != after:
+                holds = False
+                break
+        if holds:
+            rules.append([field, source, prefix, suffix, after])
+            derived.add(field)
+    return rules
+
+
+class StringTable:
+    """
+    Encode wowsinfo with a string table, see the top of this file for the format
+    """
+
+    def __init__(self):
+        self._strings = []
+        self._index = {}
+        self._fields = set()
+
+    def _string(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def _encode(self, value):
+        if isinstance(value, dict):
+            return {k: self._string(v) if k in self._fields else self._encode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._encode(v) for v in value]
+        return value
+
+    def encode(self, wowsinfo: dict) -> dict:
+        stats = {}
+        _collect_fields(wowsinfo, stats)
+        # only strings that are repeated are worth it
+        self._fields = {field for field, (only_strings, count, unique) in stats.items()
+                        if only_strings and count > len(unique)}
+
+        derived = {}
+        data = {}
+        for name, section in wowsinfo.items():
+            rules = _derived_rules(section) if isinstance(section, dict) else []
+            if len(rules) > 0:
+                derived[name] = rules
+                dropped = {rule[0] for rule in rules}
+                section = {key: {k: v for k, v in entry.items() if k not in dropped} for key, entry in section.items()}
+            data[name] = self._encode(section)
+
+        return {
+            'strings': self._strings,
+            'fields': sorted(self._fields),
+            'derived': derived,
+            'data': data,
+        }
+
+
+def decode(encoded: dict) -> dict:
+    """
+    The reference decoder, json.dumps(decode(encoded), ensure_ascii=False) is the same as wowsinfo.json
+    """
+    strings = encoded['strings']
+    fields = set(encoded['fields'])
+
+    def decode_value(value):
+        if isinstance(value, dict):
+            return {k: strings[v] if k in fields else decode_value(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [decode_value(v) for v in value]
+        return value
+
+    wowsinfo = {}
+    for name, section in encoded['data'].items():
+        section = decode_value(section)
+        for field, source, prefix, suffix, after in encoded['derived'].get(name, []):
+            for key, entry in section.items():
+                value = prefix + entry[source] + suffix
+                rebuilt = {field: value} if after is None else {}
+                for k, v in entry.items():
+                    rebuilt[k] = v
+                    if k == after:
+                        rebuilt[field] = value
+                section[key] = rebuilt
+        wowsinfo[name] = section
+    return wowsinfo
+
+
+def size_report(wowsinfo: dict, encoded: dict) -> dict:
+    """
+    Size of each section in bytes before and after, the string table is counted on its own
+    """
+    report = {}
+    for name in wowsinfo:
+        before = len(json_codec.dumps(wowsinfo[name]).encode('utf8'))
+        after = len(json_codec.dumps(encoded['data'][name]).encode('utf8'))
+        report[name] = [before, after]
+    report['strings'] = [0, len(json_codec.dumps(encoded['strings']).encode('utf8'))]
+    return report
+
+
+def write_string_table(wowsinfo: dict, filename: str) -> dict:
+    """
+    Write wowsinfo encoded with a string table to filename, print and return the size report
+    """
+    encoded = StringTable().encode(wowsinfo)
+    json_codec.write(encoded, filename)
+
+    report = size_report(wowsinfo, encoded)
+    for name, (before, after) in report.items():
+        if before > 0:
+            print('{}: {:.2f} MB -> {:.2f} MB, saved {:.0%}'.format(
+                name, before / 1024 / 1024, after / 1024 / 1024, 1 - after / before))
+        else:
+            print('{}: {:.2f} MB'.format(name, after / 1024 / 1024))
+    before = sum(b for b, _ in report.values())
+    after = sum(a for _, a in report.values())
+    print('Total: {:.2f} MB -> {:.2f} MB, saved {:.0%}'.format(before / 1024 / 1024, after / 1024 / 1024, 1 - after / before))
+    return report
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 3:
+        raise Exception('Usage: %s <wowsinfo.json> <output.json>' % sys.argv[0])
+    write_string_table(json_codec.read(sys.argv[1]), sys.argv[2])
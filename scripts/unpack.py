@@ -17,32 +17,38 @@ def _resetDir(dirname: str):
     os.makedirs(dirname)
 
 
+def unpack(game_path: str):
+    """
+    Unpack game params, languages and all assets we need from the game
+    """
+    unpacker = WoWsUnpack(game_path)
+    unpacker.reset()
+    _resetDir("scripts")
+
+    unpacker.unpackGameParams()
+    unpacker.decodeGameParams()
+
+    unpacker.unpackGameMaps()
+    unpacker.decodeLanguages()
+
+    unpacker.unpackGameIcons()
+    unpacker.unpack("scripts/*")
+    unpacker.packAppAssets()
+
+    # compress app folder
+    print("Compressing app folder...")
+    os.system(r"..\pngquant\pngquant.exe .\app\assets\*\*.png --ext .png --force")
+    # compare other resources
+    os.system(r"..\pngquant\pngquant.exe .\gui\dogTags\medium\*.png --ext .png --force")
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: %s <path to WoWs folder>" % sys.argv[0])
         sys.exit(1)
 
     try:
-        game_path = sys.argv[1]
-        unpack = WoWsUnpack(game_path)
-        unpack.reset()
-        _resetDir("scripts")
-
-        unpack.unpackGameParams()
-        unpack.decodeGameParams()
-
-        unpack.unpackGameMaps()
-        unpack.decodeLanguages()
-
-        unpack.unpackGameIcons()
-        unpack.unpack("scripts/*")
-        unpack.packAppAssets()
-
-        # compress app folder
-        print("Compressing app folder...")
-        os.system(r"..\pngquant\pngquant.exe .\app\assets\*\*.png --ext .png --force")
-        # compare other resources
-        os.system(r"..\pngquant\pngquant.exe .\gui\dogTags\medium\*.png --ext .png --force")
+        unpack(sys.argv[1])
     except Exception as e:
         print("Error: %s" % e)
         traceback.print_exc()
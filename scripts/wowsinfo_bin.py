@@ -0,0 +1,217 @@
+"""
+A binary version of wowsinfo.json. Every section and every entry of a section (like a ship) can be read
+on its own, so nothing has to be decoded until it is accessed.
+
+Layout, all numbers are little endian:
+    magic b'WINF', format version (u16), flags (u16), section count (u32)
+    for each section:
+        name length (u16), name, kind (u8), entry count (u32)
+        for each entry: key length (u16), key, offset (u64), length (u32)
+    data, offsets of entries are relative to where it starts
+
+A section of kind OBJECT has one entry per key and is read as a dict. A section of kind VALUE
+(like version) has a single entry without a key. Entries are compact json, compressed with zlib
+when FLAG_ZLIB is set. Keys are converted to strings like json does so reading it back gives the
+same result as json.load of wowsinfo.json.
+"""
+import json
+import mmap
+import struct
+import zlib
+from collections.abc import Mapping
+
+import json_codec
+
+MAGIC = b'WINF'
+FORMAT_VERSION = 1
+FLAG_ZLIB = 1
+
+KIND_OBJECT = 0
+KIND_VALUE = 1
+
+_HEADER = struct.Struct('<4sHHI')
+_SECTION = struct.Struct('<BI')
+_ENTRY = struct.Struct('<QI')
+_LENGTH = struct.Struct('<H')
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _key(key) -> str:
+    # the same key json.dumps would write
+    if isinstance(key, str):
+        return key
+    return _encoder.encode(key)
+
+
+def _pack_str(text: str) -> bytes:
+    encoded = text.encode('utf8')
+    if len(encoded) > 0xFFFF:
+        raise Exception('{}... is too long'.format(text[:32]))
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def write_bin(wowsinfo: dict, filename: str, compress: bool = False) -> int:
+    """
+    Write wowsinfo to filename and return its size in bytes
+    """
+    index = []
+    data = []
+    offset = 0
+    for name, section in wowsinfo.items():
+        if isinstance(section, dict):
+            kind = KIND_OBJECT
+            items = [(_key(k), v) for k, v in section.items()]
+        else:
+            kind = KIND_VALUE
+            items = [('', section)]
+
+        entries = []
+        for key, value in items:
+            encoded = _encoder.encode(value).encode('utf8')
+            if compress:
+                encoded = zlib.compress(encoded, 9)
+            entries.append((key, offset, len(encoded)))
+            data.append(encoded)
+            offset += len(encoded)
+        index.append((_key(name), kind, entries))
+
+    header = [_HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_ZLIB if compress else 0, len(index))]
+    for name, kind, entries in index:
+        header.append(_pack_str(name))
+        header.append(_SECTION.pack(kind, len(entries)))
+        for key, entry_offset, length in entries:
+            header.append(_pack_str(key))
+            header.append(_ENTRY.pack(entry_offset, length))
+
+    size = 0
+    with open(filename, 'wb') as f:
+        for chunk in header + data:
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+class LazySection(Mapping):
+    """
+    A read-only dict of a section, entries are decoded the first time they are accessed
+    """
+
+    def __init__(self, reader: 'WoWsInfoReader', entries: dict):
+        self._reader = reader
+        self._entries = entries
+        self._decoded = {}
+
+    def __getitem__(self, key: str):
+        if key not in self._decoded:
+            offset, length = self._entries[key]
+            self._decoded[key] = self._reader._decode(offset, length)
+        return self._decoded[key]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+
+class WoWsInfoReader:
+    """
+    Read a file from write_bin. The file is memory mapped and only the index is read when it is opened.
+    """
+
+    def __init__(self, filename: str):
+        self._file = open(filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # name -> (kind, key -> (offset, length))
+        self._sections = {}
+        self._views = {}
+
+        magic, version, self._flags, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise Exception('{} is not a wowsinfo binary'.format(filename))
+        if version != FORMAT_VERSION:
+            raise Exception('Format version {} is not supported, only {}'.format(version, FORMAT_VERSION))
+
+        position = _HEADER.size
+        for _ in range(count):
+            name, position = self._read_str(position)
+            kind, entry_count = _SECTION.unpack_from(self._map, position)
+            position += _SECTION.size
+            entries = {}
+            for _ in range(entry_count):
+                key, position = self._read_str(position)
+                entries[key] = _ENTRY.unpack_from(self._map, position)
+                position += _ENTRY.size
+            self._sections[name] = (kind, entries)
+        self._data_start = position
+
+    def _read_str(self, position: int) -> tuple:
+        length, = _LENGTH.unpack_from(self._map, position)
+        start = position + _LENGTH.size
+        return self._map[start:start + length].decode('utf8'), start + length
+
+    def _decode(self, offset: int, length: int):
+        start = self._data_start + offset
+        raw = self._map[start:start + length]
+        if self._flags & FLAG_ZLIB:
+            raw = zlib.decompress(raw)
+        return json_codec.loads(raw)
+
+    def sections(self) -> list:
+        return list(self._sections)
+
+    def section(self, name: str):
+        """
+        A LazySection for sections like ships, or the value itself for sections like version
+        """
+        if name not in self._views:
+            kind, entries = self._sections[name]
+            if kind == KIND_OBJECT:
+                self._views[name] = LazySection(self, entries)
+            else:
+                self._views[name] = self._decode(*entries[''])
+        return self._views[name]
+
+    def get(self, name: str, key: str):
+        """
+        Decode a single entry like a ship
+        """
+        kind, entries = self._sections[name]
+        if kind != KIND_OBJECT:
+            raise Exception('{} has no entries'.format(name))
+        return self._decode(*entries[key])
+
+    def to_dict(self) -> dict:
+        """
+        Decode everything, the same as json.load of wowsinfo.json
+        """
+        result = {}
+        for name, (kind, entries) in self._sections.items():
+            if kind == KIND_OBJECT:
+                result[name] = {key: self._decode(*entries[key]) for key in entries}
+            else:
+                result[name] = self._decode(*entries[''])
+        return result
+
+    def close(self):
+        self._views = {}
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) < 3:
+        raise Exception('Usage: %s <wowsinfo.json> <wowsinfo.bin> [--zlib]' % sys.argv[0])
+    size = write_bin(json_codec.read(sys.argv[1]), sys.argv[2], compress='--zlib' in sys.argv)
+    print('Wrote {} ({:.2f} MB)'.format(sys.argv[2], size / 1024 / 1024))
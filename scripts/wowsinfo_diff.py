@@ -0,0 +1,189 @@
+"""
+Find every field that has changed between two versions of wowsinfo.json.
+Subtrees are compared by hash first so only the parts that have changed are walked.
+"""
+from typing import List
+
+import json_codec
+
+
+def escape_pointer(key) -> str:
+    """
+    Escape a key for a JSON pointer (RFC 6901)
+    """
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def unescape_pointer(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def to_pointer(path: list) -> str:
+    return ''.join('/' + escape_pointer(token) for token in path)
+
+
+class SubtreeHasher:
+    """
+    Hash every subtree so two equal subtrees can be skipped without comparing them.
+    The root and sections are hashed from the hashes of their children. Anything deeper, like a ship,
+    is hashed from its json which is much faster than walking it in Python, especially with orjson. Keys in memory can
+    still be numbers, like ship ids, they are hashed as strings just like in json.
+    """
+
+    # root is 0, sections are 1
+    ENCODE_DEPTH = 2
+
+    def __init__(self):
+        # id of a dict or list -> hash, both versions have to be alive while this is used
+        self._hashes = {}
+
+    def hash(self, value, depth: int) -> int:
+        if not isinstance(value, (dict, list, tuple)):
+            # 1, 1.0 and True have the same hash but they are different in json
+            return hash(json_codec.fast_dumps(value))
+
+        value_hash = self._hashes.get(id(value))
+        if value_hash is not None:
+            return value_hash
+        if depth >= self.ENCODE_DEPTH:
+            value_hash = hash(json_codec.fast_dumps(value))
+        elif isinstance(value, dict):
+            # the order of keys doesn't matter
+            value_hash = hash(frozenset((str(k), self.hash(v, depth + 1)) for k, v in value.items()))
+        else:
+            value_hash = hash(tuple(self.hash(v, depth + 1) for v in value))
+        self._hashes[id(value)] = value_hash
+        return value_hash
+
+
+class Change:
+    """
+    A single field that is added, removed or replaced. path is a list of keys from the root.
+    """
+
+    def __init__(self, op: str, path: list, old=None, new=None):
+        self.op = op
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def to_patch(self) -> dict:
+        operation = {'op': self.op, 'path': to_pointer(self.path)}
+        if self.op != 'remove':
+            operation['value'] = self.new
+        return operation
+
+
+def diff(old, new) -> List[Change]:
+    """
+    Get all changes from old to new. Lists with a different length are replaced as a whole.
+    """
+    hasher = SubtreeHasher()
+    changes = []
+    _diff(hasher, old, new, [], changes)
+    return changes
+
+
+def _diff(hasher: SubtreeHasher, old, new, path: list, changes: list):
+    depth = len(path)
+    if hasher.hash(old, depth) == hasher.hash(new, depth):
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        new_keys = {str(k): k for k in new}
+        old_keys = {str(k): k for k in old}
+        for key in old_keys:
+            if key not in new_keys:
+                changes.append(Change('remove', path + [key], old=old[old_keys[key]]))
+            else:
+                _diff(hasher, old[old_keys[key]], new[new_keys[key]], path + [key], changes)
+        for key in new_keys:
+            if key not in old_keys:
+                changes.append(Change('add', path + [key], new=new[new_keys[key]]))
+        return
+
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)) and len(old) == len(new):
+        for i in range(len(old)):
+            _diff(hasher, old[i], new[i], path + [str(i)], changes)
+        return
+
+    changes.append(Change('replace', path, old=old, new=new))
+
+
+def make_patch(old: dict, new: dict, changes: List[Change]) -> list:
+    """
+    RFC 6902 patch from old to new. It starts with a test of the version so it can only be applied to old.
+    """
+    patch = []
+    if 'version' in old and 'version' in new:
+        patch.append({'op': 'test', 'path': '/version', 'value': old['version']})
+    patch.extend(change.to_patch() for change in changes)
+    return patch
+
+
+def apply_patch(document: dict, patch: list) -> dict:
+    """
+    Apply a patch from make_patch to document in place, only add, remove, replace and test are supported
+    """
+    for operation in patch:
+        tokens = [unescape_pointer(t) for t in operation['path'].split('/')[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            last = len(parent) if last == '-' else int(last)
+
+        op = operation['op']
+        if op == 'test':
+            if parent[last] != operation['value']:
+                raise Exception('Test failed at {}'.format(operation['path']))
+        elif op == 'remove':
+            del parent[last]
+        elif op == 'add' and isinstance(parent, list):
+            parent.insert(last, operation['value'])
+        elif op in ['add', 'replace']:
+            parent[last] = operation['value']
+        else:
+            raise Exception('Unsupported operation {}'.format(op))
+    return document
+
+
+def _format_value(value, limit: int = 80) -> str:
+    text = json_codec.dumps(value)
+    if len(text) > limit:
+        text = text[:limit - 3] + '...'
+    return text
+
+
+def changed_items(changes: List[Change]) -> dict:
+    """
+    Group changes inside an item by section and item (section -> item -> changes).
+    Items that are added or removed as a whole are not included.
+    """
+    items = {}
+    for change in changes:
+        if len(change.path) < 3:
+            continue
+        section, item = change.path[0], change.path[1]
+        items.setdefault(section, {}).setdefault(item, []).append(change)
+    return items
+
+
+def format_report(items: dict, names: dict) -> str:
+    """
+    A readable report of every changed field, names is the display name of each (section, item)
+    """
+    lines = []
+    for section in items:
+        for item, changes in items[section].items():
+            lines.append('{} {} ({})'.format(section, names.get((section, item), item), item))
+            for change in changes:
+                field = '/'.join(change.path[2:])
+                if change.op == 'add':
+                    lines.append('  + {}: {}'.format(field, _format_value(change.new)))
+                elif change.op == 'remove':
+                    lines.append('  - {}: {}'.format(field, _format_value(change.old)))
+                else:
+                    lines.append('  {}: {} -> {}'.format(field, _format_value(change.old), _format_value(change.new)))
+    return ''.join(line + '\n' for line in lines)